@@ -3,6 +3,7 @@ import sys
 import os
 import logging
 import importlib
+import importlib.util
 from pathlib import Path
 from typing import Dict, Optional, Any, Callable
 from functools import wraps
@@ -177,42 +178,56 @@ def lazy_import_with_fallback(loader: LazyComponentLoader, module_path: str,
         logger.warning(f"Using fallback for {module_path}.{class_name}")
         return fallback() if callable(fallback) else fallback
 
+_REQUIRED_DEPS = (
+    ('PyQt6', 'PyQt6'),
+    ('Pillow', 'PIL'),
+    ('cryptography', 'cryptography'),
+    ('requests', 'requests'),
+)
+
+_OPTIONAL_DEPS = (
+    ('rembg', 'rembg'),
+    ('numpy', 'numpy'),
+    ('opencv-python', 'cv2'),
+    ('boto3', 'boto3'),
+    ('onnxruntime', 'onnxruntime'),
+)
+
+def _probe_package(dep: tuple) -> tuple:
+    """Sprawdza dostępność pakietu bez jego importowania."""
+    package_name, import_name = dep
+    try:
+        return package_name, importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return package_name, False
+
 def improved_check_dependencies() -> tuple:
     """Ulepszona wersja check_dependencies z lazy loading."""
-    required_packages = {
-        'PyQt6': 'PyQt6',
-        'Pillow': 'PIL', 
-        'cryptography': 'cryptography',
-        'requests': 'requests'
-    }
+    deps = _REQUIRED_DEPS + _OPTIONAL_DEPS
+    
+    # Sondy po kolei - find_spec trzyma globalną blokadę importu, wątki nic by nie dały
+    results = [_probe_package(dep) for dep in deps]
     
-    optional_packages_map = {
-        'rembg': 'rembg',
-        'numpy': 'numpy',
-        'opencv-python': 'cv2',
-        'boto3': 'boto3',
-        'onnxruntime': 'onnxruntime'
-    }
+    required_results = results[:len(_REQUIRED_DEPS)]
+    optional_results = results[len(_REQUIRED_DEPS):]
     
     missing_critical = []
     missing_optional = []
     
     # Sprawdź krytyczne pakiety
-    for package_name, import_name in required_packages.items():
-        try:
-            importlib.import_module(import_name)
+    for package_name, available in required_results:
+        if available:
             logger.info(f"✅ Critical package {package_name} available")
-        except ImportError:
+        else:
             missing_critical.append(package_name)
             logger.error(f"❌ Critical package {package_name} missing")
     
     # Sprawdź opcjonalne pakiety (tylko jeśli krytyczne są dostępne)
     if not missing_critical:
-        for package_name, import_name in optional_packages_map.items():
-            try:
-                importlib.import_module(import_name)
+        for package_name, available in optional_results:
+            if available:
                 logger.info(f"✅ Optional package {package_name} available")
-            except ImportError:
+            else:
                 missing_optional.append(package_name)
                 logger.warning(f"⚠️ Optional package {package_name} missing")
     
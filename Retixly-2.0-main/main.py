@@ -1,9 +1,11 @@
 import sys
 import os
+import shutil
 from pathlib import Path
 import logging
+import threading
+import multiprocessing
 import importlib  # ← MUSI BYĆ
-from functools import partial
 
 
 if sys.platform == "win32":
@@ -27,14 +29,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Diagnostyka środowiska
-logger.debug("Python executable: %s", sys.executable)
-logger.debug("PYTHONPATH: %s", os.environ.get('PYTHONPATH'))
-logger.debug("Current working directory: %s", os.getcwd())
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug("Python executable: %s", sys.executable)
+    logger.debug("PYTHONPATH: %s", os.environ.get('PYTHONPATH'))
+    logger.debug("Current working directory: %s", os.getcwd())
 
 # Dodaj katalog główny projektu do PYTHONPATH
 current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir))
 
+# Dostępne języki w menu
+LANGUAGES = [
+    {"code": "en", "name": "English", "flag": "🇺🇸"},
+    {"code": "pl", "name": "Polski", "flag": "🇵🇱"},
+    {"code": "de", "name": "Deutsch", "flag": "🇩🇪"},
+    {"code": "es", "name": "Español", "flag": "🇪🇸"},
+    # Dodaj inne języki jeśli chcesz
+]
+for _lang in LANGUAGES:
+    _lang['label'] = f"{_lang['flag']} {_lang['name']}"
+del _lang
+
 # WERSJA APLIKACJI - ZMIEŃ TU PRZY KAŻDEJ NOWEJ WERSJI
 APP_VERSION = "1.0.0"
 
@@ -44,7 +59,7 @@ def import_qt():
         from PyQt6.QtWidgets import (QApplication, QMessageBox, QSplashScreen,
                                    QMainWindow, QWidget, QVBoxLayout)
         from PyQt6.QtCore import QTranslator, QLocale, Qt, QSettings, QTimer
-        from PyQt6.QtGui import QPixmap, QAction, QIcon
+        from PyQt6.QtGui import QPixmap, QPixmapCache, QAction, QActionGroup, QIcon, QImageReader
         return {
             'QApplication': QApplication,
             'QMessageBox': QMessageBox,
@@ -53,7 +68,10 @@ def import_qt():
             'QLocale': QLocale,
             'Qt': Qt,
             'QPixmap': QPixmap,
+            'QPixmapCache': QPixmapCache,
+            'QImageReader': QImageReader,
             'QAction': QAction,
+            'QActionGroup': QActionGroup,
             'QIcon': QIcon,
             'QMainWindow': QMainWindow,
             'QWidget': QWidget,
@@ -88,7 +106,9 @@ def setup_environment():
 def load_environment_config():
     """Ładuje konfigurację z pliku .env jeśli istnieje."""
     env_file = Path('.env')
-    logger.debug("Szukam pliku .env w: %s", env_file.absolute())
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Szukam pliku .env w: %s", env_file.absolute())
     
     if env_file.exists():
         logger.debug("Znaleziono plik .env")
@@ -98,8 +118,10 @@ def load_environment_config():
                     line = line.strip()
                     if line and not line.startswith('#') and '=' in line:
                         key, value = line.split('=', 1)
-                        os.environ[key.strip()] = value.strip()
-                        logger.debug("Załadowano: %s=...", key.strip())
+                        key = key.strip()
+                        os.environ[key] = value.strip()
+                        if debug:
+                            logger.debug("Załadowano: %s=...", key)
             logger.info("Załadowano konfigurację z pliku .env")
         except Exception as e:
             logger.warning(f"Błąd ładowania pliku .env: {e}")
@@ -108,11 +130,57 @@ def load_environment_config():
         logger.debug("Plik .env nie znaleziony!")
         logger.info("Plik .env nie znaleziony - używam domyślnej konfiguracji")
 
+def _discover_translations(base_dir):
+    """Zwraca mapę kod języka -> plik .qm z katalogu aplikacji i translations/."""
+    found = {}
+    # translations/ najpierw, żeby plik z katalogu głównego miał pierwszeństwo
+    for directory in (base_dir / "translations", base_dir):
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("retixly_") and name.endswith(".qm"):
+                    found[name[8:-3]] = Path(entry.path)
+    return found
+
+def cached_import(module_path, attr_name):
+    """Zwraca atrybut modułu, importując moduł tylko gdy nie ma go w sys.modules."""
+    module = sys.modules.get(module_path)
+    if module is None:
+        module = importlib.import_module(module_path)
+    try:
+        return getattr(module, attr_name)
+    except AttributeError as e:
+        raise ImportError(f"Moduł {module_path} nie definiuje {attr_name}") from e
+
+# Komponenty ładowane w init_components: (atrybut, moduł, klasa, fabryka, metoda awaryjna)
+_COMPONENTS = (
+    ('settings', 'src.controllers.settings_controller', 'SettingsController',
+     lambda app, cls: cls(), 'create_mock_settings'),
+    ('main_window', 'src.views.main_window', 'MainWindow',
+     lambda app, cls: cls(app.settings, app_instance=app), 'create_emergency_window'),
+)
+
 class RetixlyApp:
     def __init__(self):
         # Importuj klasy Qt
         self.qt = import_qt()
+        # Wartości domyślne zamiast sprawdzania hasattr() w każdej metodzie
         self.translator = None
+        self.settings = None
+        self.main_window = None
+        self.splash = None
+        self._splash_image = None
+        self.license_controller = None
+        self.updater = None
+        self._language_group = None
+        self._language_menu = None
+        self._help_menu = None
+        self._base_dir = current_dir
+        # Mapa kod języka -> plik .qm, budowana raz zamiast sprawdzania ścieżek przy każdej zmianie
+        self._qm_cache = _discover_translations(self._base_dir)
+        self._available_locales = frozenset(self._qm_cache)
         try:
             # Upewnij się, że mamy argumenty dla QApplication
             if not sys.argv:
@@ -123,6 +191,14 @@ class RetixlyApp:
             self.app.setApplicationVersion(APP_VERSION)
             self.app.setOrganizationName("RetixlySoft")
             self.app.setOrganizationDomain("retixly.com")
+            self._tr = getattr(self.app, 'translate', lambda context, text: text)
+            
+            # Większy cache pixmap (KB) - miniatury ponownie dodanych plików nie są dekodowane drugi raz
+            self.qt['QPixmapCache'].setCacheLimit(102400)
+            
+            # Jeden translator zainstalowany na stałe - zmiana języka podmienia tylko jego katalog
+            self.translator = self.qt['QTranslator']()
+            self.app.installTranslator(self.translator)
             
             # Pokaż ekran powitalny jeśli istnieje
             self.show_splash_screen()
@@ -142,7 +218,7 @@ class RetixlyApp:
             self.init_auto_updater()
             
             # Ukryj ekran powitalny i pokaż główne okno
-            if hasattr(self, 'splash'):
+            if self.splash:
                 self.splash.finish(self.main_window)
             
             self.main_window.show()
@@ -158,10 +234,7 @@ class RetixlyApp:
     def init_auto_updater(self):
         """Inicjalizuje system automatycznych aktualizacji"""
         try:
-            if hasattr(self, 'splash'):
-                self.splash.showMessage("Inicjalizacja systemu aktualizacji...", 
-                                      self.qt['Qt'].AlignmentFlag.AlignBottom | self.qt['Qt'].AlignmentFlag.AlignCenter)
-                self.app.processEvents()
+            self.show_splash_message("Inicjalizacja systemu aktualizacji...")
             
             from src.core.updater import AutoUpdater
             self.updater = AutoUpdater(self.main_window, current_version=APP_VERSION)
@@ -178,7 +251,7 @@ class RetixlyApp:
     def check_for_updates_manually(self):
         """Ręczne sprawdzanie aktualizacji (dla menu)"""
         try:
-            if hasattr(self, 'updater'):
+            if self.updater:
                 self.updater.check_for_updates(silent=False)
             else:
                 msg = self.qt['QMessageBox'](self.main_window)
@@ -193,43 +266,45 @@ class RetixlyApp:
         splash_path = Path("assets/icons/splash.png")
         if splash_path.exists():
             try:
-                splash_pixmap = self.qt['QPixmap'](str(splash_path))
-                if not splash_pixmap.isNull():
-                    self.splash = self.qt['QSplashScreen'](splash_pixmap)
+                # Rozmiar czytamy z nagłówka - dekodowanie PNG idzie w tle
+                size = self.qt['QImageReader'](str(splash_path)).size()
+                if size.isValid():
+                    placeholder = self.qt['QPixmap'](size)
+                    placeholder.fill(self.qt['Qt'].GlobalColor.white)
+                    self.splash = self.qt['QSplashScreen'](placeholder)
                     self.splash.show()
-                    self.splash.showMessage("Inicjalizacja aplikacji...", 
-                                          self.qt['Qt'].AlignmentFlag.AlignBottom | self.qt['Qt'].AlignmentFlag.AlignCenter)
-                    self.app.processEvents()
+                    threading.Thread(target=self._decode_splash_image,
+                                     args=(str(splash_path),), daemon=True).start()
+                    self.show_splash_message("Inicjalizacja aplikacji...")
                 else:
                     logger.warning("Plik splash.png istnieje ale nie można go załadować")
             except Exception as e:
                 logger.warning(f"Nie można załadować ekranu powitalnego: {e}")
 
+    def _decode_splash_image(self, splash_path):
+        """Dekoduje obraz ekranu powitalnego poza wątkiem GUI."""
+        image = self.qt['QImageReader'](splash_path).read()
+        if image.isNull():
+            logger.warning("Plik splash.png istnieje ale nie można go załadować")
+        else:
+            self._splash_image = image
+
+    def show_splash_message(self, message):
+        """Aktualizuje ekran powitalny, podmieniając obraz gdy jest już zdekodowany."""
+        if not self.splash:
+            return
+        if self._splash_image is not None:
+            self.splash.setPixmap(self.qt['QPixmap'].fromImage(self._splash_image))
+            self._splash_image = None
+        self.splash.showMessage(message,
+                                self.qt['Qt'].AlignmentFlag.AlignBottom | self.qt['Qt'].AlignmentFlag.AlignCenter)
+
     def init_components(self):
         """Inicjalizacja głównych komponentów aplikacji."""
         try:
-            # Bezpieczne importy wewnętrzne
-            try:
-                from src.controllers.settings_controller import SettingsController
-                self.settings = SettingsController()
-                logger.info("SettingsController załadowany pomyślnie")
-            except ImportError as e:
-                logger.error(f"Nie można załadować SettingsController: {e}")
-                # Stwórz podstawowy mock jeśli nie można załadować
-                self.settings = self.create_mock_settings()
-            
-            try:
-                from src.views.main_window import MainWindow
-                try:
-                    self.main_window = MainWindow(self.settings, app_instance=self)
-                except TypeError as e:
-                    logger.error(f"Błąd tworzenia MainWindow (możliwy problem z sygnałami): {e}")
-                    self.main_window = self.create_emergency_window()
-                logger.info("MainWindow załadowany pomyślnie")
-            except ImportError as e:
-                logger.error(f"Nie można załadować MainWindow: {e}")
-                # Stwórz podstawowe okno awaryjne
-                self.main_window = self.create_emergency_window()
+            # Bezpieczne importy wewnętrzne (kolejność ma znaczenie - okno potrzebuje ustawień)
+            for attr, module_path, class_name, factory, fallback in _COMPONENTS:
+                setattr(self, attr, self._load_component(module_path, class_name, factory, fallback))
             
             # Translator will be initialized in load_language()
             
@@ -241,7 +316,7 @@ class RetixlyApp:
 
             # Inicjalizacja silnika obrazów
             try:
-                from src.core.engine_manager import engine_manager
+                engine_manager = cached_import('src.core.engine_manager', 'engine_manager')
                 engine_manager.initialize_engine(max_workers=4)
                 logger.info("Image engine initialized")
             except Exception as e:
@@ -251,13 +326,25 @@ class RetixlyApp:
             logger.error(f"Błąd podczas inicjalizacji komponentów: {e}")
             raise
 
+    def _load_component(self, module_path, class_name, factory, fallback):
+        """Importuje i tworzy komponent, w razie błędu używa fabryki awaryjnej."""
+        try:
+            component_class = cached_import(module_path, class_name)
+        except ImportError as e:
+            logger.error(f"Nie można załadować {class_name}: {e}")
+            return getattr(self, fallback)()
+        try:
+            component = factory(self, component_class)
+        except TypeError as e:
+            logger.error(f"Błąd tworzenia {class_name} (możliwy problem z sygnałami): {e}")
+            return getattr(self, fallback)()
+        logger.info(f"{class_name} załadowany pomyślnie")
+        return component
+
     def init_license_system(self):
         """Inicjalizuje system licencji."""
         try:
-            if hasattr(self, 'splash'):
-                self.splash.showMessage("Inicjalizacja systemu licencji...", 
-                                      self.qt['Qt'].AlignmentFlag.AlignBottom | self.qt['Qt'].AlignmentFlag.AlignCenter)
-                self.app.processEvents()
+            self.show_splash_message("Inicjalizacja systemu licencji...")
             
             # Inicjalizuj kontroler licencji
             from src.controllers.license_controller import get_license_controller
@@ -285,7 +372,7 @@ class RetixlyApp:
     def check_license_notifications(self):
         """Sprawdza czy trzeba pokazać notyfikacje dotyczące licencji."""
         try:
-            if not hasattr(self, 'license_controller'):
+            if not self.license_controller:
                 return
                 
             subscription_info = self.license_controller.get_subscription_info()
@@ -306,21 +393,22 @@ class RetixlyApp:
 
     def show_expiry_warning(self, days_left: int):
         """Pokazuje ostrzeżenie o wygasającej subskrypcji."""
+        QMessageBox = self.qt['QMessageBox']
         try:
-            msg = self.qt['QMessageBox'](self.main_window)
-            msg.setIcon(self.qt['QMessageBox'].Icon.Warning)
+            msg = QMessageBox(self.main_window)
+            msg.setIcon(QMessageBox.Icon.Warning)
             msg.setWindowTitle("Subscription Expiring Soon")
             msg.setText(f"Your Retixly Pro subscription will expire in {days_left} days.")
             msg.setInformativeText("Would you like to manage your subscription now?")
             
             msg.setStandardButtons(
-                self.qt['QMessageBox'].StandardButton.Yes | 
-                self.qt['QMessageBox'].StandardButton.Later
+                QMessageBox.StandardButton.Yes | 
+                QMessageBox.StandardButton.Later
             )
-            msg.setDefaultButton(self.qt['QMessageBox'].StandardButton.Later)
+            msg.setDefaultButton(QMessageBox.StandardButton.Later)
             
             result = msg.exec()
-            if result == self.qt['QMessageBox'].StandardButton.Yes:
+            if result == QMessageBox.StandardButton.Yes:
                 # Otwórz dialog subskrypcji
                 if hasattr(self.main_window, 'show_subscription_dialog'):
                     self.main_window.show_subscription_dialog()
@@ -330,9 +418,10 @@ class RetixlyApp:
 
     def show_grace_period_warning(self, days_left: int):
         """Pokazuje ostrzeżenie o grace period."""
+        QMessageBox = self.qt['QMessageBox']
         try:
-            msg = self.qt['QMessageBox'](self.main_window)
-            msg.setIcon(self.qt['QMessageBox'].Icon.Critical)
+            msg = QMessageBox(self.main_window)
+            msg.setIcon(QMessageBox.Icon.Critical)
             msg.setWindowTitle("License Verification Required")
             msg.setText(f"Your license verification is required within {days_left} days.")
             msg.setInformativeText(
@@ -426,39 +515,29 @@ class RetixlyApp:
     def load_language(self):
         """Uproszczone ładowanie języka."""
         try:
-            locale = self.settings.get_language() if hasattr(self, 'settings') else 'en'
-
-            # Usuń poprzedni translator
-            if hasattr(self, 'translator') and self.translator:
-                self.app.removeTranslator(self.translator)
+            locale = self.settings.get_language() if self.settings else 'en'
+            self._apply_locale(locale)
+        except Exception as e:
+            logger.error(f"Language loading error: {e}")
 
-            # Angielski = domyślny, nie potrzeba plików
-            if locale == 'en':
-                logger.info("Using default English language")
-                self.translator = None
-                return
+    def _apply_locale(self, locale):
+        """Podmienia katalog zainstalowanego translatora na plik .qm dla podanego języka."""
+        # Angielski = domyślny, nie potrzeba plików - pusty load() czyści katalog
+        if locale == 'en':
+            self.translator.load("")
+            logger.info("Using default English language")
+            return
 
-            # Ładuj tylko jeśli nie jest angielskim
-            self.translator = self.qt['QTranslator']()
-            base_dir = Path(__file__).resolve().parent
-            translation_file = base_dir / f"retixly_{locale}.qm"
-            if not translation_file.exists():
-                translation_file = base_dir / "translations" / f"retixly_{locale}.qm"
-
-            if translation_file.exists():
-                if self.translator.load(str(translation_file.absolute())):
-                    self.app.installTranslator(self.translator)
-                    logger.info(f"✅ Loaded translation: {locale}")
-                else:
-                    logger.warning(f"❌ Failed to load: {translation_file}")
-                    self.translator = None
-            else:
-                logger.info(f"📁 Translation file not found: {translation_file}")
-                self.translator = None
+        if locale not in self._available_locales:
+            self.translator.load("")
+            logger.info(f"📁 Translation file not found for: {locale}")
+            return
 
-        except Exception as e:
-            logger.error(f"Language loading error: {e}")
-            self.translator = None
+        translation_file = self._qm_cache[locale]
+        if self.translator.load(str(translation_file)):
+            logger.info(f"✅ Loaded translation: {locale}")
+        else:
+            logger.warning(f"❌ Failed to load: {translation_file}")
 
     def retranslate_all_widgets(self):
         """Ponownie tłumaczy wszystkie widgety w aplikacji."""
@@ -476,55 +555,23 @@ class RetixlyApp:
         """Zmienia język aplikacji - POPRAWIONA WERSJA."""
         try:
             # Zapisz ustawienie języka
-            if hasattr(self, "settings"):
+            if self.settings:
                 self.settings.set_value("general", "language", lang_code)
 
-            # Usuń poprzedni translator jeśli istnieje
-            if hasattr(self, 'translator') and self.translator:
-                self.app.removeTranslator(self.translator)
-                self.translator = None
-
-            # Angielski = domyślny język, nie potrzeba plików
-            if lang_code == 'en':
-                logger.info("Switched to default English language")
-                self.retranslate_all_widgets()
-                self.update_language_menu_selection(lang_code)
-                return
-
-            # Dla innych języków - próbuj załadować plik tłumaczenia
-            self.translator = self.qt['QTranslator']()
-            base_dir = Path(__file__).resolve().parent
-            translation_file = base_dir / f"retixly_{lang_code}.qm"
-            if not translation_file.exists():
-                translation_file = base_dir / "translations" / f"retixly_{lang_code}.qm"
-
-            if translation_file.exists():
-                if self.translator.load(str(translation_file.absolute())):
-                    self.app.installTranslator(self.translator)
-                    logger.info(f"✅ Language switched to: {lang_code}")
-                else:
-                    logger.warning(f"❌ Failed to load translation: {translation_file}")
-                    self.translator = None
-            else:
-                logger.info(f"📁 Translation file not found: {translation_file}")
-                logger.info("Staying with default English")
-                self.translator = None
-
-            # Przetłumacz interfejs
-            self.retranslate_all_widgets()
+            # load() na zainstalowanym translatorze sam wysyła LanguageChange -
+            # ręczne rozsyłanie zdarzenia tłumaczyłoby drzewo widgetów drugi raz
+            self._apply_locale(lang_code)
             self.update_language_menu_selection(lang_code)
 
             # Opcjonalnie: pokaż komunikat o zmianie języka
-            if hasattr(self, 'main_window'):
+            if self.main_window:
                 self.main_window.statusBar().showMessage(f"Language changed to: {lang_code}", 3000)
 
         except Exception as e:
             logger.error(f"Error changing language: {e}")
             # W przypadku błędu - przywróć angielski
-            if hasattr(self, 'translator') and self.translator:
-                self.app.removeTranslator(self.translator)
-                self.translator = None
-            if hasattr(self, "settings"):
+            self.translator.load("")
+            if self.settings:
                 self.settings.set_value("general", "language", "en")
 
     def send_language_change_event(self):
@@ -659,16 +706,9 @@ class RetixlyApp:
 
     def create_menu_bar(self):
         """Tworzy pasek menu z wyborem języka i opcjami aktualizacji."""
-        if not hasattr(self, "main_window"):
+        QAction = self.qt['QAction']
+        if not self.main_window:
             return
-        # Dostępne języki
-        languages = [
-            {"code": "en", "name": "English", "flag": "🇺🇸"},
-            {"code": "pl", "name": "Polski", "flag": "🇵🇱"},
-            {"code": "de", "name": "Deutsch", "flag": "🇩🇪"},
-            {"code": "es", "name": "Español", "flag": "🇪🇸"},
-            # Dodaj inne języki jeśli chcesz
-        ]
         main_window = self.main_window
         menu_bar = main_window.menuBar() if hasattr(main_window, "menuBar") else None
         if not menu_bar:
@@ -681,7 +721,7 @@ class RetixlyApp:
         help_menu = menu_bar.addMenu("Help")
         
         # Akcja sprawdzania aktualizacji
-        check_updates_action = self.qt['QAction']("🔄 Check for Updates", main_window)
+        check_updates_action = QAction("🔄 Check for Updates", main_window)
         check_updates_action.triggered.connect(self.check_for_updates_manually)
         help_menu.addAction(check_updates_action)
         
@@ -689,177 +729,129 @@ class RetixlyApp:
         help_menu.addSeparator()
         
         # Informacje o wersji
-        about_action = self.qt['QAction'](f"ℹ️ About Retixly {APP_VERSION}", main_window)
+        about_action = QAction(f"ℹ️ About Retixly {APP_VERSION}", main_window)
         about_action.triggered.connect(self.show_about_dialog)
         help_menu.addAction(about_action)
         
         # Utwórz menu języka
         language_menu = menu_bar.addMenu("Language")
-        # Przechowuj akcje językowe
-        self.language_actions = {}
-        current_lang = self.settings.get_language() if hasattr(self, "settings") else "en"
-        for lang in languages:
-            action = self.qt['QAction'](f"{lang['flag']} {lang['name']}", main_window)
+        # Grupa wyłączna - Qt sam odznacza poprzednio wybrany język
+        language_group = self.qt['QActionGroup'](main_window)
+        language_group.setExclusive(True)
+        current_lang = self.settings.get_language() if self.settings else "en"
+        for lang in LANGUAGES:
+            action = QAction(lang['label'], main_window)
             action.setCheckable(True)
+            action.setData(lang["code"])
             action.setChecked(lang["code"] == current_lang)
-            action.triggered.connect(partial(self.change_language_safe, lang["code"]))
+            language_group.addAction(action)
             language_menu.addAction(action)
-            self.language_actions[lang["code"]] = action
+        language_group.triggered.connect(lambda action: self.change_language_safe(action.data()))
+        self._language_group = language_group
         language_menu.setTitle("Language")
         # Zapamiętaj menu do retranslacji
-        self._language
+        self._language_menu = language_menu
         self._help_menu = help_menu
 
     def show_about_dialog(self):
         """Pokazuje dialog z informacjami o aplikacji."""
-        try:
-            msg = self.qt['QMessageBox'](self.main_window)
-            msg.setWindowTitle("About Retixly")
-            msg.setIcon(self.qt['QMessageBox'].Icon.Information)
-            msg.setText(f"<h2>Retixly {APP_VERSION}</h2>")
-            msg.setInformativeText(
-                f"<p><b>Version:</b> {APP_VERSION}</p>"
-                "<p><b>Developer:</b> RetixlySoft</p>"
-                "<p><b>License:</b> MIT License</p>"
-                "<br>"
-                "<p>Advanced AI-powered background removal tool</p>"
-                "<p>Built with PyQt6 and modern AI models</p>"
-            )
-            msg.setStandardButtons(self.qt['QMessageBox'].StandardButton.Ok)
-            msg.exec()
-        except Exception as e:
-            logger.error(f"Błąd pokazywania dialogu About: {e}")
+        QMessageBox = self.qt['QMessageBox']
+        msg = QMessageBox(self.main_window)
+        msg.setWindowTitle("About Retixly")
+        msg.setIcon(QMessageBox.Icon.Information)
+        msg.setText(f"<h2>Retixly {APP_VERSION}</h2>")
+        msg.setInformativeText(
+            f"<p><b>Version:</b> {APP_VERSION}</p>"
+            "<p><b>Developer:</b> RetixlySoft</p>"
+            "<p><b>License:</b> MIT License</p>"
+            "<br>"
+            "<p>Advanced AI-powered background removal tool</p>"
+            "<p>Built with PyQt6 and modern AI models</p>"
+        )
+        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msg.exec()
 
     def change_language_safe(self, lang_code):
         """Bezpieczna zmiana języka - POPRAWIONA."""
         try:
-            logger.info(f"🌍 Changing language to: {lang_code}")
-            logger.info(f"🔍 Available language actions: {list(self.language_actions.keys()) if hasattr(self, 'language_actions') else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available language actions: %s",
+                             [a.data() for a in self._language_group.actions()] if self._language_group else None)
             
             # Zapisz ustawienie
-            if hasattr(self, "settings"):
+            if self.settings:
                 self.settings.set_value("general", "language", lang_code)
             
-            # POPRAWKA: Zawsze usuń translator przed zmianą
-            if hasattr(self, 'translator') and self.translator:
-                self.app.removeTranslator(self.translator)
-            self.translator = None
-            
-            # Dla angielskiego - resetuj do domyślnego
-            if lang_code == 'en':
-                logger.info("✅ Reset to default English language")
-                self.update_language_menu_selection(lang_code)
-                # WAŻNE: Wywołaj retranslację dla angielskiego też!
-                self.force_retranslate_ui()
-                return
-            
-            # Dla innych języków - spróbuj załadować
-            base_dir = Path(__file__).resolve().parent
-            
-            # Sprawdź różne lokalizacje
-            possible_paths = [
-                base_dir / f"retixly_{lang_code}.qm",  # główny katalog
-                base_dir / "translations" / f"retixly_{lang_code}.qm",  # podkatalog
-            ]
+            # Translator jest zainstalowany na stałe - load() podmienia katalog,
+            # a Qt sam wysyła pojedynczy LanguageChange do widgetów
+            requested = lang_code
+            translation_file = None if lang_code == 'en' else self._qm_cache.get(lang_code)
             
-            translation_file = None
-            for path in possible_paths:
-                if path.exists():
-                    translation_file = path
-                    break
-            
-            if translation_file:
-                self.translator = self.qt['QTranslator']()
-                
-                if self.translator.load(str(translation_file.absolute())):
-                    self.app.installTranslator(self.translator)
-                    logger.info(f"✅ Language switched to: {lang_code} from {translation_file}")
-                else:
-                    logger.warning(f"❌ Failed to load: {translation_file}")
-                    self.translator = None
-                    lang_code = 'en'
-            else:
-                logger.info(f"📁 Translation file not found for: {lang_code}")
-                logger.info(f"📂 Searched in: {[str(p) for p in possible_paths]}")
-                self.translator = None
+            if translation_file is None:
+                # Angielski lub brak pliku - pusty load() przywraca teksty źródłowe
+                self.translator.load("")
+                lang_code = 'en'
+            elif not self.translator.load(str(translation_file)):
+                logger.warning(f"❌ Failed to load: {translation_file}")
+                translation_file = None
                 lang_code = 'en'
             
-            # Aktualizuj menu
-            self.update_language_menu_selection(lang_code)
+            logger.info("🌍 Language %s -> %s (file=%s)", requested, lang_code, translation_file)
             
-            # ZAWSZE wywołaj retranslację
-            self.force_retranslate_ui()
+            # Zaznaczenie klikniętej akcji obsługuje QActionGroup - poprawiamy je tylko przy powrocie do angielskiego
+            if lang_code != requested:
+                self.update_language_menu_selection(lang_code)
             
         except Exception as e:
             logger.error(f"❌ Language change error: {e}")
             # W przypadku błędu - wróć do angielskiego
-            if hasattr(self, 'translator') and self.translator:
-                self.app.removeTranslator(self.translator)
-            self.translator = None
+            self.translator.load("")
             self.update_language_menu_selection('en')
 
     def force_retranslate_ui(self):
         """Wymusza retranslację całego UI."""
-        try:
-            from PyQt6.QtCore import QEvent
-            from PyQt6.QtWidgets import QApplication
-            
-            # Wyślij tylko LanguageChange event
-            language_change_event = QEvent(QEvent.Type.LanguageChange)
-            QApplication.sendEvent(self.main_window, language_change_event)
-            
-            logger.info("✅ Forced UI retranslation completed")
-            
-        except Exception as e:
-            logger.error(f"Error during forced retranslation: {e}")
+        from PyQt6.QtCore import QEvent
+        from PyQt6.QtWidgets import QApplication
+        
+        # Wyślij tylko LanguageChange event
+        QApplication.sendEvent(self.main_window, QEvent(QEvent.Type.LanguageChange))
+        logger.info("✅ Forced UI retranslation completed")
 
     def update_language_menu_selection(self, lang_code):
-        """Aktualizuje zaznaczenie w menu języka."""
-        try:
-            if hasattr(self, 'language_actions'):
-                for code, action in self.language_actions.items():
-                    action.setChecked(code == lang_code)
-                logger.info(f"✅ Updated language menu selection to: {lang_code}")
-            else:
-                logger.warning("❌ language_actions not found")
-        except Exception as e:
-            logger.error(f"Menu update error: {e}")
+        """Zaznacza język w menu, gdy zmiana nie pochodzi z kliknięcia w akcję."""
+        if not self._language_group:
+            logger.warning("❌ Language action group not found")
+            return
+        for action in self._language_group.actions():
+            if action.data() == lang_code:
+                action.setChecked(True)
+                break
+        logger.debug("Updated language menu selection to: %s", lang_code)
 
     def retranslate_ui(self):
         """Aktualizuje teksty UI po zmianie języka."""
-        # Przetłumacz tytuł okna
-        if hasattr(self, "main_window"):
-            try:
-                _ = self.app.translate
-            except AttributeError:
-                _ = lambda context, text: text
-            try:
-                self.main_window.setWindowTitle(_("Retixly", f"Retixly {APP_VERSION}"))
-            except Exception as e:
-                logger.warning(f"Nie można ustawić tytułu głównego okna: {e}")
-            # Przetłumacz menu języka jeśli istnieje
-            if hasattr(self, "_language_menu"):
-                self._language_menu.setTitle(_("Menu", "Language"))
-            if hasattr(self, "_help_menu"):
-                self._help_menu.setTitle(_("Menu", "Help"))
+        if not self.main_window:
+            return
+        # Przetłumacz tytuł okna i menu
+        _ = self._tr
+        self.main_window.setWindowTitle(_("Retixly", f"Retixly {APP_VERSION}"))
+        if self._language_menu:
+            self._language_menu.setTitle(_("Menu", "Language"))
+        if self._help_menu:
+            self._help_menu.setTitle(_("Menu", "Help"))
         # Sygnalizuj dzieciom do retranslacji jeśli mają taką metodę
-        if hasattr(self, "main_window") and hasattr(self.main_window, "retranslate_ui"):
-            try:
-                self.main_window.retranslate_ui()
-            except Exception:
-                pass
+        retranslate_window = getattr(self.main_window, "retranslate_ui", None)
+        if retranslate_window:
+            retranslate_window()
 
     def show_error_message(self, title, message):
         """Wyświetla okno dialogowe z błędem."""
-        try:
-            error_dialog = self.qt['QMessageBox']()
-            error_dialog.setIcon(self.qt['QMessageBox'].Icon.Critical)
-            error_dialog.setWindowTitle(title)
-            error_dialog.setText(message)
-            error_dialog.exec()
-        except Exception as e:
-            logger.error(f"Nie można wyświetlić okna błędu: {e}")
-            print(f"CRITICAL ERROR: {title} - {message}")
+        QMessageBox = self.qt['QMessageBox']
+        error_dialog = QMessageBox()
+        error_dialog.setIcon(QMessageBox.Icon.Critical)
+        error_dialog.setWindowTitle(title)
+        error_dialog.setText(message)
+        error_dialog.exec()
 
     def run(self):
         """Uruchamia główną pętlę aplikacji."""
@@ -871,13 +863,13 @@ class RetixlyApp:
             return 1
         finally:
             # Czyści zasoby przy zamknięciu
-            if hasattr(self, 'license_controller'):
+            if self.license_controller:
                 try:
                     self.license_controller.cleanup()
                 except Exception as e:
                     logger.error(f"Błąd podczas czyszczenia licencji: {e}")
                     
-            if hasattr(self, 'updater'):
+            if self.updater:
                 try:
                     self.updater.cleanup()
                 except Exception as e:
@@ -926,8 +918,9 @@ def main():
         print(f"CRITICAL IMPORT ERROR: {e}")
         if 'qt' in locals():
             try:
-                error_dialog = qt['QMessageBox']()
-                error_dialog.setIcon(qt['QMessageBox'].Icon.Critical)
+                QMessageBox = qt['QMessageBox']
+                error_dialog = QMessageBox()
+                error_dialog.setIcon(QMessageBox.Icon.Critical)
                 error_dialog.setWindowTitle("Błąd importu")
                 error_dialog.setText(f"Nie można zaimportować wymaganych bibliotek:\n{str(e)}")
                 error_dialog.exec()
@@ -939,8 +932,9 @@ def main():
         logger.critical(f"Krytyczny błąd aplikacji: {e}")
         if 'qt' in locals():
             try:
-                error_dialog = qt['QMessageBox']()
-                error_dialog.setIcon(qt['QMessageBox'].Icon.Critical)
+                QMessageBox = qt['QMessageBox']
+                error_dialog = QMessageBox()
+                error_dialog.setIcon(QMessageBox.Icon.Critical)
                 error_dialog.setWindowTitle("Błąd krytyczny")
                 error_dialog.setText(f"Wystąpił błąd podczas uruchamiania aplikacji:\n{str(e)}")
                 error_dialog.setDetailedText(
@@ -963,19 +957,24 @@ def cleanup_temp_files():
     try:
         temp_dir = Path('temp')
         if temp_dir.exists():
-            for temp_file in temp_dir.glob('*'):
-                try:
-                    if temp_file.is_file():
-                        temp_file.unlink()
-                        logger.info(f"Usunięto plik tymczasowy: {temp_file}")
-                    elif temp_file.is_dir():
-                        import shutil
-                        shutil.rmtree(temp_file)
-                        logger.info(f"Usunięto katalog tymczasowy: {temp_file}")
-                except Exception as e:
-                    logger.warning(f"Nie można usunąć pliku tymczasowego {temp_file}: {e}")
+            removed = 0
+            # DirEntry trzyma typ z readdir - bez osobnego stat() dla każdego pliku
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            os.unlink(entry.path)
+                            removed += 1
+                        elif entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)
+                            removed += 1
+                    except OSError as e:
+                        logger.warning(f"Nie można usunąć pliku tymczasowego {entry.path}: {e}")
+            logger.info("Usunięto %d elementów tymczasowych", removed)
     except Exception as e:
         logger.warning(f"Błąd podczas czyszczenia plików tymczasowych: {e}")
 
 if __name__ == "__main__":
+    # Wymagane przez pulę procesów przetwarzania wsadowego w zamrożonym exe (Windows)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
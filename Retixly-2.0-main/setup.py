@@ -6,15 +6,15 @@ from cx_Freeze import setup, Executable
 current_dir = Path(__file__).parent
 
 # Pliki do dołączenia
-include_files = [
+INCLUDE_FILES = (
     ("assets", "assets"),
     ("translations", "translations"), 
     ("data", "data"),
     ("src", "src"),
-]
+)
 
-# Pakiety do dołączenia
-packages = [
+# Pakiety do dołączenia (cx_Freeze dołącza je w całości, razem z podmodułami)
+PACKAGES = (
     "PyQt6",
     "PIL", 
     "rembg",
@@ -33,27 +33,18 @@ packages = [
     "urllib",
     "ssl",
     "socket",
-]
+)
 
-# Moduły do jawnego dołączenia
-includes = [
-    "PyQt6.QtCore",
-    "PyQt6.QtGui", 
-    "PyQt6.QtWidgets",
-    "PIL.Image",
-    "PIL.ImageFilter",
-    "PIL.ImageEnhance",
-    "rembg.bg",
-    "numpy.core._multiarray_umath",
-    "requests.adapters",
-    "cryptography.hazmat.backends.openssl",
+# Moduły do jawnego dołączenia - tylko te spoza PACKAGES,
+# podmoduły pakietów z listy wyżej są już dołączone
+INCLUDES = (
     "src.controllers.settings_controller",
     "src.views.main_window",
     "src.core.updater",
-]
+)
 
 # Moduły do pominięcia  
-excludes = [
+EXCLUDES = (
     "tkinter",
     "unittest",
     "test",
@@ -63,14 +54,14 @@ excludes = [
     "IPython",
     "matplotlib.tests",
     "numpy.tests",
-]
+)
 
 # Opcje budowania - NAPRAWIONE
 build_exe_options = {
-    "packages": packages,
-    "includes": includes,
-    "excludes": excludes,
-    "include_files": include_files,
+    "packages": list(PACKAGES),
+    "includes": list(INCLUDES),
+    "excludes": list(EXCLUDES),
+    "include_files": list(INCLUDE_FILES),
     "optimize": 2,
     # USUNIĘTE: "include_msvcrt": True,  # Ta opcja nie istnieje
     "zip_include_packages": ["*"],
@@ -18,13 +18,10 @@ class ExportSettings(QWidget):
         export_type_layout.addWidget(QLabel(self.tr("Export to:")))
         
         self.export_type = QComboBox()
-        self.export_type.addItems([
-            self.tr("Local Folder"),
-            "Google Drive",
-            "Amazon S3",
-            "FTP",
-            "imgBB"
-        ])
+        # Tekst może być przetłumaczony - identyfikator backendu trzymany w danych elementu
+        self.export_type.addItem(self.tr("Local Folder"), "Local Folder")
+        for export_type in ("Google Drive", "Amazon S3", "FTP", "imgBB"):
+            self.export_type.addItem(export_type, export_type)
         self.export_type.currentIndexChanged.connect(self.show_export_settings)
         export_type_layout.addWidget(self.export_type)
         
@@ -299,7 +296,7 @@ class ExportSettings(QWidget):
             )
         
     def get_settings(self):
-        export_type = self.export_type.currentText()
+        export_type = self.export_type.currentData()
         settings = {
             'type': export_type,
             'filename_pattern': self.filename_pattern.text(),
@@ -307,7 +304,7 @@ class ExportSettings(QWidget):
         }
         
         # Dodanie specyficznych ustawień dla wybranego typu eksportu
-        if export_type == self.tr("Local Folder"):
+        if export_type == "Local Folder":
             settings['path'] = self.local_path.text()
         elif export_type == "Google Drive":
             settings['folder_id'] = self.gdrive_folder.text()
@@ -1,12 +1,57 @@
-from PyQt6.QtWidgets import QLabel, QWidget, QVBoxLayout
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap, QDragEnterEvent, QDropEvent
+import os
+
+from PIL import Image
+from PyQt6.QtWidgets import QLabel, QWidget, QVBoxLayout, QSizePolicy
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QRunnable, QThreadPool, QTimer
+from PyQt6.QtGui import QPixmap, QImage, QDragEnterEvent, QDropEvent
+
+_VALID_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.gif'})
+
+
+class _LoadSignals(QObject):
+    loaded = pyqtSignal(str, QImage)
+
+
+class _LoadTask(QRunnable):
+    """Dekoduje i zmniejsza obraz poza wątkiem GUI."""
+
+    def __init__(self, image_path, target_size):
+        super().__init__()
+        self.image_path = image_path
+        self.target_size = target_size
+        self.signals = _LoadSignals()
+
+    def run(self):
+        try:
+            # Zapas 2x na późniejsze powiększenie widoku bez ponownego dekodowania
+            width, height = self.target_size
+            target_size = (width * 2, height * 2)
+            with Image.open(self.image_path) as img:
+                # Dla JPEG libjpeg skaluje już podczas dekodowania (w dziedzinie DCT)
+                img.draft('RGB', target_size)
+                img = img.convert('RGBA')
+            img.thumbnail(target_size, Image.Resampling.LANCZOS)
+            data = img.tobytes()
+            qimage = QImage(data, img.width, img.height, img.width * 4,
+                            QImage.Format.Format_RGBA8888).copy()
+        except Exception:
+            # Pillow nie obsługuje pliku - ImageView zdekoduje go przez Qt
+            qimage = QImage()
+        self.signals.loaded.emit(self.image_path, qimage)
+
 
 class ImageView(QWidget):
     image_dropped = pyqtSignal(str)
     
     def __init__(self, placeholder_text="", parent=None):
         super().__init__(parent)
+        self._pending_path = None
+        self._original_pixmap = None
+        # Płynne skalowanie dopiero gdy rozmiar się ustabilizuje
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(16)
+        self._smooth_timer.timeout.connect(self._smooth_rescale)
         self.init_ui(placeholder_text)
         
     def init_ui(self, placeholder_text):
@@ -17,6 +62,8 @@ class ImageView(QWidget):
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_label.setMinimumSize(300, 300)
+        # Rozmiar etykiety wyznacza układ, a nie wstawiony pixmap
+        self.image_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
         self.image_label.setStyleSheet("""
             QLabel {
                 border: 2px dashed #999;
@@ -46,18 +93,47 @@ class ImageView(QWidget):
                 break
                 
     def load_image(self, image_path):
-        pixmap = QPixmap(image_path)
-        scaled_pixmap = pixmap.scaled(
+        size = self.image_label.size()
+        self._pending_path = image_path
+        task = _LoadTask(image_path, (size.width(), size.height()))
+        task.signals.loaded.connect(self._on_image_loaded)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_image_loaded(self, image_path, qimage):
+        # Ignoruj wyniki starszych upuszczeń
+        if image_path != self._pending_path:
+            return
+        self._pending_path = None
+        if qimage.isNull():
+            self._original_pixmap = QPixmap(image_path)
+        else:
+            self._original_pixmap = QPixmap.fromImage(qimage)
+        self._rescale()
+
+    def _rescale(self, mode=Qt.TransformationMode.FastTransformation):
+        if self._original_pixmap is None:
+            return
+        self.image_label.setPixmap(self._original_pixmap.scaled(
             self.image_label.size(),
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.image_label.setPixmap(scaled_pixmap)
+            mode
+        ))
+        if mode == Qt.TransformationMode.FastTransformation:
+            self._smooth_timer.start()
+
+    def _smooth_rescale(self):
+        self._rescale(Qt.TransformationMode.SmoothTransformation)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._rescale()
         
     def clear_image(self):
+        self._pending_path = None
+        self._original_pixmap = None
+        self._smooth_timer.stop()
         self.image_label.clear()
         
     @staticmethod
     def is_valid_image(file_path):
-        valid_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
-        return any(file_path.lower().endswith(ext) for ext in valid_extensions)
+        return os.path.splitext(file_path)[1].lower() in _VALID_EXTENSIONS
@@ -1,10 +1,27 @@
+import copy
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
                            QLabel, QSpinBox, QCheckBox, QGroupBox)
 from PyQt6.QtCore import Qt
 
 class MarketplaceSettings(QWidget):
+    # Wymagania marketplace'ów
+    _REQUIREMENTS = {
+        "Amazon": {"size": "1500x1500", "format": "JPEG"},
+        "eBay": {"size": "1600x1600", "format": "JPEG"},
+        "Allegro": {"size": "2000x2000", "format": "JPEG"},
+        "Shopify": {"size": "2048x2048", "format": "JPEG"}
+    }
+    
+    # Predefiniowane rozmiary (kwadratowe) -> długość boku
+    _SIZE_MAP = {
+        "1000x1000 px": 1000,
+        "1500x1500 px": 1500,
+        "2000x2000 px": 2000,
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._cached_settings = None
         self.init_ui()
         
     def init_ui(self):
@@ -30,9 +47,7 @@ class MarketplaceSettings(QWidget):
         
         # Predefiniowane rozmiary
         self.size_combo = QComboBox()
-        self.size_combo.addItems([
-            "1000x1000 px", "1500x1500 px", "2000x2000 px", "Custom"
-        ])
+        self.size_combo.addItems([*self._SIZE_MAP, "Custom"])
         self.size_combo.currentTextChanged.connect(self.update_size_inputs)
         size_layout.addWidget(self.size_combo)
         
@@ -96,32 +111,49 @@ class MarketplaceSettings(QWidget):
         layout.addStretch()
         self.setLayout(layout)
         
+        # Każda zmiana w widgetach unieważnia zapamiętane ustawienia
+        for combo in (self.marketplace_combo, self.format_combo):
+            combo.currentTextChanged.connect(self._invalidate_settings)
+        for spin in (self.width_spin, self.height_spin, self.quality_spin):
+            spin.valueChanged.connect(self._invalidate_settings)
+        for checkbox in (self.optimize_cb, self.metadata_cb, self.naming_cb):
+            checkbox.toggled.connect(self._invalidate_settings)
+        
+    def _invalidate_settings(self, *args):
+        self._cached_settings = None
+        
     def update_requirements(self, marketplace):
         # Aktualizacja wymagań w zależności od wybranego marketplace
-        requirements = {
-            "Amazon": {"size": "1500x1500", "format": "JPEG"},
-            "eBay": {"size": "1600x1600", "format": "JPEG"},
-            "Allegro": {"size": "2000x2000", "format": "JPEG"},
-            "Shopify": {"size": "2048x2048", "format": "JPEG"}
-        }
-        
-        if marketplace in requirements:
-            req = requirements[marketplace]
-            self.size_combo.setCurrentText(f"{req['size']} px")
-            self.format_combo.setCurrentText(req['format'])
+        req = self._REQUIREMENTS.get(marketplace)
+        if req:
+            # Bez sygnałów - inaczej każda zmiana wraca kaskadą do update_size_inputs
+            combos = (self.size_combo, self.format_combo)
+            for combo in combos:
+                combo.blockSignals(True)
+            try:
+                self.size_combo.setCurrentText(f"{req['size']} px")
+                self.format_combo.setCurrentText(req['format'])
+            finally:
+                for combo in combos:
+                    combo.blockSignals(False)
+            self._invalidate_settings()
+            self.update_size_inputs(self.size_combo.currentText())
             
     def update_size_inputs(self, size_text):
         is_custom = size_text == "Custom"
         self.width_spin.setEnabled(is_custom)
         self.height_spin.setEnabled(is_custom)
         
-        if not is_custom:
-            size = size_text.split('x')[0]
-            self.width_spin.setValue(int(size))
-            self.height_spin.setValue(int(size))
+        size = self._SIZE_MAP.get(size_text)
+        if size:
+            self.width_spin.setValue(size)
+            self.height_spin.setValue(size)
             
     def get_settings(self):
-        return {
+        # Kopia - wywołujący może modyfikować wynik (także zagnieżdżone słowniki) bez psucia cache
+        if self._cached_settings is not None:
+            return copy.deepcopy(self._cached_settings)
+        self._cached_settings = {
             'marketplace': self.marketplace_combo.currentText(),
             'size': {
                 'width': self.width_spin.value(),
@@ -135,3 +167,4 @@ class MarketplaceSettings(QWidget):
             'remove_metadata': self.metadata_cb.isChecked(),
             'use_naming_convention': self.naming_cb.isChecked()
         }
+        return copy.deepcopy(self._cached_settings)
@@ -1,118 +1,266 @@
-from PyQt6.QtWidgets import (QListWidget, QListWidgetItem, QLabel, 
-                           QWidget, QHBoxLayout, QPushButton)
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap, QIcon
-from ..utils.image_utils import create_thumbnail
+from PyQt6.QtWidgets import (QListView, QStyledItemDelegate, QStyle, QAbstractItemView,
+                           QApplication)
+from PyQt6.QtCore import (Qt, pyqtSignal, QObject, QRunnable, QThreadPool,
+                          QAbstractListModel, QModelIndex, QRect, QSize, QEvent)
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QColor
+from ..utils.image_utils import create_thumbnail_image
 from ..utils.file_utils import get_supported_formats
 import os
 
-class ThumbnailItem(QWidget):
-    remove_requested = pyqtSignal(QListWidgetItem)
+THUMBNAIL_SIZE = (60, 60)
+ROW_MARGIN = 2
+REMOVE_BUTTON_SIZE = 20
+FILE_PATH_ROLE = Qt.ItemDataRole.UserRole
+
+def _pixmap_cache_key(file_path):
+    """Klucz QPixmapCache - zmiana pliku na dysku unieważnia wpis."""
+    try:
+        return f"thumb:{os.path.abspath(file_path)}:{os.path.getmtime(file_path)}"
+    except OSError:
+        return None
+
+_placeholder = None
+
+def _placeholder_pixmap():
+    """Wspólna miniatura zastępcza wyświetlana do czasu wczytania obrazu."""
+    global _placeholder
+    if _placeholder is None:
+        _placeholder = QPixmap(*THUMBNAIL_SIZE)
+        _placeholder.fill(Qt.GlobalColor.lightGray)
+    return _placeholder
+
+def _iter_files(root):
+    """Rekurencyjnie zwraca (nazwa, ścieżka) plików - os.scandir zamiast os.walk."""
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.name, entry.path
+    except OSError:
+        return
+
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(str, QImage)
+
+class ThumbnailWorker(QRunnable):
+    """Dekoduje miniaturę w puli wątków (QImage, nie QPixmap - bezpieczne poza GUI)."""
     
-    def __init__(self, file_path, parent=None):
-        super().__init__(parent)
+    def __init__(self, file_path, signals):
+        super().__init__()
         self.file_path = file_path
-        self.init_ui()
+        self.signals = signals
+        
+    def run(self):
+        self.signals.loaded.emit(self.file_path, create_thumbnail_image(self.file_path, THUMBNAIL_SIZE))
+
+class ThumbnailModel(QAbstractListModel):
+    """Lista plików z miniaturami - jedna ścieżka i (opcjonalnie) pixmapa na wiersz."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._pixmaps = {}  # ścieżka -> QPixmap (wspólna dla powtórzonych plików)
+        self._path_counts = {}  # ścieżka -> liczba wierszy z tym plikiem
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path = self._paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(file_path)
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(file_path)
+            return pixmap if pixmap is not None else _placeholder_pixmap()
+        if role in (FILE_PATH_ROLE, Qt.ItemDataRole.ToolTipRole):
+            return file_path
+        return None
+        
+    def paths(self):
+        return list(self._paths)
+        
+    def contains(self, file_path):
+        return file_path in self._path_counts
+        
+    def add_paths(self, paths):
+        if not paths:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(paths) - 1)
+        self._paths.extend(paths)
+        for file_path in paths:
+            self._path_counts[file_path] = self._path_counts.get(file_path, 0) + 1
+        self.endInsertRows()
+        
+    def remove_row(self, row):
+        if not 0 <= row < len(self._paths):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        file_path = self._paths.pop(row)
+        self._path_counts[file_path] -= 1
+        if not self._path_counts[file_path]:
+            del self._path_counts[file_path]
+            self._pixmaps.pop(file_path, None)
+        self.endRemoveRows()
+        
+    def clear(self):
+        self.beginResetModel()
+        self._paths.clear()
+        self._pixmaps.clear()
+        self._path_counts.clear()
+        self.endResetModel()
         
-    def init_ui(self):
-        layout = QHBoxLayout()
-        layout.setContentsMargins(2, 2, 2, 2)
+    def set_thumbnail(self, file_path, pixmap):
+        if file_path not in self._path_counts:
+            return
+        self._pixmaps[file_path] = pixmap
+        # Jeden sygnał na cały zakres - widok odświeża tylko widoczny obszar,
+        # bez szukania wierszy z tą ścieżką
+        last = len(self._paths) - 1
+        self.dataChanged.emit(self.index(0), self.index(last), [Qt.ItemDataRole.DecorationRole])
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Rysuje wiersz (miniatura, nazwa, ×) bez tworzenia widżetów dla każdego pliku."""
+    remove_requested = pyqtSignal(QModelIndex)
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), THUMBNAIL_SIZE[1] + 2 * ROW_MARGIN)
+        
+    def _remove_rect(self, rect):
+        return QRect(rect.right() - ROW_MARGIN - REMOVE_BUTTON_SIZE,
+                     rect.center().y() - REMOVE_BUTTON_SIZE // 2,
+                     REMOVE_BUTTON_SIZE, REMOVE_BUTTON_SIZE)
+        
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+        
+        rect = option.rect
+        painter.save()
         
-        # Miniatura
-        thumbnail = create_thumbnail(self.file_path, (60, 60))
-        thumbnail_label = QLabel()
-        thumbnail_label.setPixmap(thumbnail)
-        layout.addWidget(thumbnail_label)
+        # Miniatura - wycentrowana w polu THUMBNAIL_SIZE
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        thumb_rect = QRect(rect.left() + ROW_MARGIN, rect.top() + ROW_MARGIN, *THUMBNAIL_SIZE)
+        if pixmap is not None:
+            x = thumb_rect.left() + (thumb_rect.width() - pixmap.width()) // 2
+            y = thumb_rect.top() + (thumb_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
         
         # Nazwa pliku
-        filename = os.path.basename(self.file_path)
-        name_label = QLabel(filename)
-        name_label.setStyleSheet("padding-left: 5px;")
-        layout.addWidget(name_label, 1)
+        remove_rect = self._remove_rect(rect)
+        text_rect = QRect(thumb_rect.right() + 1 + 5, rect.top(),
+                          remove_rect.left() - thumb_rect.right() - 10, rect.height())
+        text = option.fontMetrics.elidedText(index.data(Qt.ItemDataRole.DisplayRole) or "",
+                                             Qt.TextElideMode.ElideMiddle, text_rect.width())
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.setPen(option.palette.highlightedText().color() if selected
+                       else option.palette.text().color())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
         
         # Przycisk usuwania
-        remove_btn = QPushButton("×")
-        remove_btn.setFixedSize(20, 20)
-        remove_btn.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background: transparent;
-                color: #666;
-            }
-            QPushButton:hover {
-                color: #f00;
-            }
-        """)
-        remove_btn.clicked.connect(self.request_removal)
-        layout.addWidget(remove_btn)
-        
-        self.setLayout(layout)
-        
-    def request_removal(self):
-        parent = self.parent()
-        while parent and not isinstance(parent, QListWidget):
-            parent = parent.parent()
-        if parent:
-            for i in range(parent.count()):
-                if parent.itemWidget(parent.item(i)) == self:
-                    self.remove_requested.emit(parent.item(i))
-                    break
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QColor("#f00") if hovered else QColor("#666"))
+        painter.drawText(remove_rect, Qt.AlignmentFlag.AlignCenter, "×")
+        
+        painter.restore()
+        
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._remove_rect(option.rect).contains(event.position().toPoint())):
+            self.remove_requested.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
 
-class ThumbnailList(QListWidget):
+class ThumbnailList(QListView):
     files_changed = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
-        self.setDragDropMode(QListWidget.DragDropMode.DragDrop)
-        self.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DropOnly)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.setUniformItemSizes(True)
         self.setSpacing(2)
+        self.setMouseTracking(True)
+        
+        self._model = ThumbnailModel(self)
+        self.setModel(self._model)
+        self._delegate = ThumbnailDelegate(self)
+        self._delegate.remove_requested.connect(self.remove_item)
+        self.setItemDelegate(self._delegate)
         
-        self.supported_formats = get_supported_formats()
+        self.supported_formats = frozenset(fmt.lower() for fmt in get_supported_formats())
+        
+        # Asynchroniczne wczytywanie miniatur
+        self._pending_thumbnails = set()  # ścieżki, dla których worker już pracuje
+        self._thumbnail_signals = _ThumbnailSignals(self)
+        self._thumbnail_signals.loaded.connect(self._on_thumbnail_loaded)
+        self._thread_pool = QThreadPool.globalInstance()
+        self._thread_pool.setMaxThreadCount(os.cpu_count() or 1)
         
     def add_files(self, files):
-        for file_path in files:
-            if self.is_supported_file(file_path):
-                self.add_thumbnail(file_path)
-        self.files_changed.emit()
+        self._add_paths(file_path for file_path in files if self.is_supported_file(file_path))
         
     def add_folder(self, folder_path):
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self.is_supported_file(file_path):
-                    self.add_thumbnail(file_path)
+        self._add_paths(file_path for name, file_path in _iter_files(folder_path)
+                        if self.is_supported_file(name))
+        
+    def _add_paths(self, paths):
+        """Dodaje wiele plików jednym wstawieniem wierszy do modelu."""
+        paths = list(paths)
+        self._model.add_paths(paths)
+        for file_path in paths:
+            self._request_thumbnail(file_path)
         self.files_changed.emit()
         
     def add_thumbnail(self, file_path):
-        item = QListWidgetItem()
-        thumbnail_widget = ThumbnailItem(file_path)
-        thumbnail_widget.remove_requested.connect(self.remove_item)
+        self._model.add_paths([file_path])
+        self._request_thumbnail(file_path)
+        
+    def _request_thumbnail(self, file_path):
+        # Miniatura już zdekodowana w tej sesji - bez ponownego wczytywania
+        key = _pixmap_cache_key(file_path)
+        if key:
+            pixmap = QPixmapCache.find(key)
+            if pixmap is not None and not pixmap.isNull():
+                self._model.set_thumbnail(file_path, pixmap)
+                return
+        
+        if file_path not in self._pending_thumbnails:
+            self._pending_thumbnails.add(file_path)
+            self._thread_pool.start(ThumbnailWorker(file_path, self._thumbnail_signals))
         
-        item.setSizeHint(thumbnail_widget.sizeHint())
-        self.addItem(item)
-        self.setItemWidget(item, thumbnail_widget)
+    def _on_thumbnail_loaded(self, file_path, image):
+        self._pending_thumbnails.discard(file_path)
+        pixmap = QPixmap.fromImage(image)
+        key = _pixmap_cache_key(file_path)
+        if key:
+            QPixmapCache.insert(key, pixmap)
+        # Model ignoruje ścieżki, które w międzyczasie usunięto z listy
+        self._model.set_thumbnail(file_path, pixmap)
         
-    def remove_item(self, item):
-        self.takeItem(self.row(item))
+    def remove_item(self, index):
+        self._model.remove_row(index.row())
         self.files_changed.emit()
         
     def clear(self):
-        super().clear()
+        self._model.clear()
         self.files_changed.emit()
         
+    def count(self):
+        return self._model.rowCount()
+        
     def get_files(self):
-        files = []
-        for i in range(self.count()):
-            item = self.item(i)
-            widget = self.itemWidget(item)
-            files.append(widget.file_path)
-        return files
+        return self._model.paths()
         
     def is_supported_file(self, file_path):
-        ext = os.path.splitext(file_path)[1].lower()[1:]
-        return ext in self.supported_formats
+        _, dot, ext = file_path.rpartition('.')
+        return bool(dot) and ext.lower() in self.supported_formats
         
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -120,6 +268,12 @@ class ThumbnailList(QListWidget):
         else:
             event.ignore()
             
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.accept()
+        else:
+            event.ignore()
+            
     def dropEvent(self, event):
         files = []
         for url in event.mimeData().urls():
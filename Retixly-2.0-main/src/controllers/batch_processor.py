@@ -1,4 +1,4 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QThread
 from PIL import Image, ImageEnhance
 import os
 import cv2
@@ -6,14 +6,135 @@ import numpy as np
 from pathlib import Path
 import tempfile
 import shutil
+import subprocess
+import time
+import multiprocessing
+import re
+import struct
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..utils.image_utils import load_image_downscaled
 
 # Import rembg tylko jeśli dostępny
 try:
-    from rembg import remove as rembg_remove
+    from rembg import remove as rembg_remove, new_session
     HAS_REMBG = True
 except ImportError:
     HAS_REMBG = False
 
+# Sesje rembg tworzone raz na proces (model ONNX ładowany tylko przy pierwszym użyciu)
+_rembg_sessions = {}
+
+# Kolejność preferencji dostawców onnxruntime: CUDA, DirectML (Windows), CPU
+_PREFERRED_PROVIDERS = ('CUDAExecutionProvider', 'DmlExecutionProvider', 'CPUExecutionProvider')
+
+# Natywny rozmiar wejścia modeli - dla nich zmniejszamy obraz sami (OpenCV jest szybszy od PIL)
+_MODEL_INPUT_SIZE = {
+    'u2net': 320,
+    'u2netp': 320,
+    'u2net_human_seg': 320,
+    'silueta': 320,
+}
+
+# Przy aktywnym GPU każdy proces roboczy ma własną sesję (osobna kopia modelu w VRAM,
+# wszystkie konkurują o jedno urządzenie) - wtedy pula jest ograniczana do tylu procesów
+GPU_MAX_WORKERS = 2
+
+@lru_cache(maxsize=1)
+def _rembg_providers():
+    """Dostawcy onnxruntime dla rembg w kolejności preferencji (CUDA, DirectML, CPU)."""
+    try:
+        import onnxruntime
+        available = onnxruntime.get_available_providers()
+    except ImportError:
+        return ('CPUExecutionProvider',)
+    return tuple(p for p in _PREFERRED_PROVIDERS if p in available) or ('CPUExecutionProvider',)
+
+def _get_rembg_session(model_name='u2netp'):
+    """Zwraca współdzieloną sesję rembg, w miarę możliwości na GPU (CUDA/DirectML)."""
+    session = _rembg_sessions.get(model_name)
+    if session is None:
+        providers = list(_rembg_providers())
+        print(f"DEBUG: Creating rembg session {model_name} with providers {providers}")
+        session = new_session(model_name, providers=providers)
+        _rembg_sessions[model_name] = session
+    return session
+
+# grabCut (fallback bez rembg) liczony na obrazie zmniejszonym do tego boku
+GRABCUT_MAX_SIDE = 512
+GRABCUT_ITERATIONS = 2
+GRABCUT_MIN_FOREGROUND = 0.05  # udział pikseli obiektu poniżej którego maska jest podejrzana
+
+# Specyfikacje marketplace: rozmiar docelowy i kolor tła
+_MARKETPLACE_SPECS = {
+    'Amazon': {'size': (2000, 2000), 'bg_color': (255, 255, 255)},
+    'eBay': {'size': (1600, 1600), 'bg_color': (255, 255, 255)},
+    'Etsy': {'size': (2000, 2000), 'bg_color': (255, 255, 255)},
+    'Allegro': {'size': (1600, 1600), 'bg_color': (255, 255, 255)},
+    'Shopify': {'size': (2048, 2048), 'bg_color': (255, 255, 255)},
+    'WeChat': {'size': (800, 800), 'bg_color': (255, 255, 255)}
+}
+_DEFAULT_MARKETPLACE_SPEC = {'size': (1600, 1600), 'bg_color': (255, 255, 255)}
+
+_HEX_COLOR_RE = re.compile(r'^#[0-9a-fA-F]{6}$')
+
+@lru_cache(maxsize=32)
+def _hex_to_rgb(value):
+    """Zamienia kolor '#RRGGBB' na krotkę (R, G, B)."""
+    if not _HEX_COLOR_RE.match(value):
+        raise ValueError(f"Nieprawidłowy kolor: {value}")
+    return struct.unpack('>BBB', bytes.fromhex(value[1:]))
+
+# Zdarzenia sterujące współdzielone z procesami roboczymi (ustawiane w _init_worker)
+_stop_event = None
+_run_event = None
+
+# Potok przetwarzania używany przez proces roboczy (tworzony w _worker)
+_pipeline = None
+
+def _init_worker(stop_event, run_event, onnx_threads=None):
+    """Inicjalizuje proces roboczy puli - zapamiętuje zdarzenia stop/pauza i limit wątków ONNX."""
+    global _stop_event, _run_event
+    _stop_event = stop_event
+    _run_event = run_event
+    # Każdy proces ma własną sesję onnxruntime; bez limitu każda startuje pulę wątków
+    # na wszystkie rdzenie (N procesów x N wątków). rembg czyta OMP_NUM_THREADS przy
+    # tworzeniu sesji, a sesja powstaje dopiero po tym inicjalizatorze.
+    if onnx_threads:
+        os.environ['OMP_NUM_THREADS'] = str(onnx_threads)
+
+def _worker(image_path, settings, output_dir):
+    """Przetwarza i zapisuje jeden obraz w procesie roboczym.
+
+    Funkcja modułowa, żeby dało się ją przekazać do ProcessPoolExecutor.
+    Zwraca słownik z wynikiem w formacie ProcessingThread.processed_files.
+    """
+    if _run_event is not None:
+        _run_event.wait()
+    if _stop_event is not None and _stop_event.is_set():
+        return {'original': image_path, 'processed': None, 'success': False, 'error': 'Cancelled'}
+
+    if not os.path.exists(image_path):
+        print(f"DEBUG: File not found: {image_path}")
+        return {'original': image_path, 'processed': None, 'success': False, 'error': 'File not found'}
+
+    # Jeden potok na proces i partię - bufory (np. tło marketplace) są współdzielone
+    global _pipeline
+    if _pipeline is None or _pipeline.settings != settings:
+        _pipeline = ImagePipeline(settings)
+    pipeline = _pipeline
+    processed_image = pipeline.process_single_image(image_path)
+    if not processed_image:
+        return {'original': image_path, 'processed': None, 'success': False, 'error': 'Failed to process'}
+
+    output_path = pipeline.save_processed_image(processed_image, image_path, output_dir)
+    if not output_path:
+        return {'original': image_path, 'processed': None, 'success': False, 'error': 'Failed to save'}
+
+    print(f"DEBUG: Successfully processed: {output_path}")
+    return {'original': image_path, 'processed': output_path, 'success': True}
+
 class BatchProcessor(QObject):
     progress_updated = pyqtSignal(int, int, str)  # current, total, message
     processing_finished = pyqtSignal(list)  # lista przetworzonych plików
@@ -34,9 +155,10 @@ class BatchProcessor(QObject):
         
         # Utworzenie wątku przetwarzającego
         self.current_thread = ProcessingThread(image_files, settings)
-        self.current_thread.progress_updated.connect(self.progress_updated)
-        self.current_thread.error_occurred.connect(self.error_occurred)
-        self.current_thread.finished_with_results.connect(self.processing_finished)
+        queued = Qt.ConnectionType.QueuedConnection
+        self.current_thread.progress_updated.connect(self.progress_updated, queued)
+        self.current_thread.error_occurred.connect(self.error_occurred, queued)
+        self.current_thread.finished_with_results.connect(self.processing_finished, queued)
         
         self.current_thread.start()
 
@@ -63,6 +185,8 @@ class ProcessingThread(QThread):
     error_occurred = pyqtSignal(str)
     finished_with_results = pyqtSignal(list)  # lista przetworzonych plików
     
+    PROGRESS_INTERVAL = 0.05  # minimalny odstęp (s) między sygnałami postępu
+    
     def __init__(self, image_files, settings):
         super().__init__()
         self.image_files = image_files
@@ -70,6 +194,9 @@ class ProcessingThread(QThread):
         self.is_running = True
         self.is_paused = False
         self.processed_files = []
+        self._stop_event = multiprocessing.Event()
+        self._run_event = multiprocessing.Event()
+        self._run_event.set()
 
     def run(self):
         print(f"DEBUG: ProcessingThread.run() started with {len(self.image_files)} files")
@@ -79,66 +206,62 @@ class ProcessingThread(QThread):
         output_dir = self.prepare_output_directory()
         print(f"DEBUG: Output directory: {output_dir}")
         
-        for i, image_file in enumerate(self.image_files, 1):
-            if not self.is_running:
-                print("DEBUG: Processing stopped by user")
-                break
-                
-            while self.is_paused:
-                self.msleep(100)
-                
-            try:
-                print(f"DEBUG: Processing file {i}/{total}: {image_file}")
-                
-                # Sprawdź czy plik istnieje
-                if not os.path.exists(image_file):
-                    print(f"DEBUG: File not found: {image_file}")
+        # Każdy obraz jest niezależny i obciąża CPU - przetwarzaj je równolegle
+        cpu_count = os.cpu_count() or 1
+        max_workers = max(1, min(cpu_count, total))
+        if self._uses_gpu_inference():
+            max_workers = min(max_workers, GPU_MAX_WORKERS)
+            print(f"DEBUG: GPU inference active, limiting pool to {max_workers} workers")
+        # Rdzenie dzielone między procesy - wątki wewnętrzne onnxruntime na proces
+        onnx_threads = max(1, cpu_count // max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(self._stop_event, self._run_event, onnx_threads)) as executor:
+            futures = {
+                executor.submit(_worker, image_file, self.settings, output_dir): image_file
+                for image_file in self.image_files
+            }
+            
+            last_emit = 0.0
+            for done, future in enumerate(as_completed(futures), 1):
+                image_file = futures[future]
+                if future.cancelled():
                     continue
-                
-                # Aktualizuj progress
-                self.progress_updated.emit(i, total, f"Przetwarzanie {Path(image_file).name}...")
-                
-                # Przetwórz obraz
-                processed_image = self.process_single_image(image_file)
-                
-                if processed_image:
-                    # Zapisz obraz
-                    output_path = self.save_processed_image(processed_image, image_file, output_dir)
-                    if output_path:
-                        self.processed_files.append({
-                            'original': image_file,
-                            'processed': output_path,
-                            'success': True
-                        })
-                        print(f"DEBUG: Successfully processed: {output_path}")
-                    else:
-                        self.processed_files.append({
-                            'original': image_file,
-                            'processed': None,
-                            'success': False,
-                            'error': 'Failed to save'
-                        })
-                else:
-                    self.processed_files.append({
+                    
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"DEBUG: Error processing {image_file}: {str(e)}")
+                    result = {
                         'original': image_file,
                         'processed': None,
                         'success': False,
-                        'error': 'Failed to process'
-                    })
-                
-            except Exception as e:
-                print(f"DEBUG: Error processing {image_file}: {str(e)}")
-                self.processed_files.append({
-                    'original': image_file,
-                    'processed': None,
-                    'success': False,
-                    'error': str(e)
-                })
+                        'error': str(e)
+                    }
+                    
+                    # Jeśli nie ma opcji pomijania błędów, zatrzymaj
+                    if not self.settings.get('skip_errors', True):
+                        self.stop()
+                        for pending in futures:
+                            pending.cancel()
+                        self.processed_files.append(result)
+                        self.error_occurred.emit(f"Błąd podczas przetwarzania {Path(image_file).name}: {str(e)}")
+                        return
                 
-                # Jeśli nie ma opcji pomijania błędów, zatrzymaj
-                if not self.settings.get('skip_errors', True):
-                    self.error_occurred.emit(f"Błąd podczas przetwarzania {Path(image_file).name}: {str(e)}")
-                    return
+                if result.get('error') == 'Cancelled':
+                    continue
+                    
+                self.processed_files.append(result)
+                if self.is_running:
+                    # Najwyżej ~20 aktualizacji na sekundę - każda budzi wątek GUI
+                    now = time.monotonic()
+                    if now - last_emit >= self.PROGRESS_INTERVAL or done == total:
+                        self.progress_updated.emit(done, total, f"Przetworzono {Path(image_file).name}")
+                        last_emit = now
+                else:
+                    print("DEBUG: Processing stopped by user")
+                    for pending in futures:
+                        pending.cancel()
 
         if self.is_running:
             successful = len([f for f in self.processed_files if f['success']])
@@ -148,6 +271,15 @@ class ProcessingThread(QThread):
         # Wyślij wyniki
         self.finished_with_results.emit(self.processed_files)
 
+    def _uses_gpu_inference(self):
+        """Czy partia będzie liczyć maski rembg na GPU (CUDA/DirectML)."""
+        if not HAS_REMBG:
+            return False
+        processing_mode = self.settings.get('processing', {}).get('mode', 'Usuń tło')
+        if processing_mode not in ('Usuń tło', 'Zamień tło'):
+            return False
+        return _rembg_providers()[0] != 'CPUExecutionProvider'
+
     def prepare_output_directory(self):
         """Przygotowuje katalog wyjściowy."""
         save_location = self.settings.get('save_location', 'Lokalnie')
@@ -163,14 +295,47 @@ class ProcessingThread(QThread):
         print(f"DEBUG: Using default output directory: {default_output}")
         return str(default_output)
 
+    def pause(self):
+        self.is_paused = True
+        self._run_event.clear()
+
+    def resume(self):
+        self.is_paused = False
+        self._run_event.set()
+
+    def stop(self):
+        print("DEBUG: ProcessingThread.stop() called")
+        self.is_running = False
+        self._stop_event.set()
+        # Odblokuj wstrzymane procesy robocze, żeby mogły zakończyć pracę
+        self._run_event.set()
+
+class ImagePipeline:
+    """Potok przetwarzania pojedynczego obrazu (uruchamiany w procesie roboczym)."""
+    
+    def __init__(self, settings):
+        self.settings = settings
+        # Płótno marketplace wielokrotnego użytku: (rozmiar, kolor) -> Image
+        self._mp_canvas = None
+        self._mp_canvas_key = None
+        # Wyuczone modele tła/obiektu grabCut, współdzielone w obrębie partii
+        self._grabcut_models = None
+
     def process_single_image(self, image_path):
         """Przetwarza pojedynczy obraz zgodnie z ustawieniami."""
         try:
             print(f"DEBUG: Loading image: {image_path}")
             
-            # Wczytaj obraz
-            image = Image.open(image_path)
-            if image.mode != 'RGBA':
+            # Wczytaj obraz - przy przygotowaniu do marketplace od razu pomniejszony do
+            # rozmiaru docelowego (shrink-on-load), i tak byłby zmniejszony na końcu potoku.
+            # RGB (np. JPEG) zostaje bez pustego kanału alpha - potrzebny jest dopiero
+            # przy kompozycji; pozostałe tryby (P, L, CMYK...) sprowadzamy do RGBA
+            marketplace_spec = self._marketplace_spec()
+            if marketplace_spec is not None:
+                image = load_image_downscaled(image_path, marketplace_spec['size'])
+            else:
+                image = Image.open(image_path)
+            if image.mode not in ('RGB', 'RGBA'):
                 image = image.convert('RGBA')
             
             # Sprawdź tryb przetwarzania
@@ -197,43 +362,105 @@ class ProcessingThread(QThread):
 
     def remove_background(self, image):
         """Usuwa tło z obrazu."""
+        return Image.fromarray(self._remove_background_array(image), 'RGBA')
+
+    def _remove_background_array(self, image):
+        """Usuwa tło i zwraca wynik jako tablicę RGBA (bez konwersji do PIL)."""
         try:
             if HAS_REMBG:
                 print("DEBUG: Using rembg for background removal")
-                # Konwertuj PIL do numpy array
-                img_array = np.array(image)
+                # Konwertuj PIL do numpy array - rembg nie potrzebuje kanału alpha,
+                # a asarray nie robi dodatkowej kopii bufora
+                img_array = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
                 # Usuń tło
-                result = rembg_remove(img_array)
-                return Image.fromarray(result)
+                return self._rembg_array(img_array)
             else:
                 print("DEBUG: rembg not available, using simple background removal")
-                return self.simple_background_removal(image)
+                return self._simple_background_array(image)
         except Exception as e:
             print(f"DEBUG: Error in remove_background: {str(e)}")
-            return self.simple_background_removal(image)
+            return self._simple_background_array(image)
+
+    def _rembg_model_name(self):
+        """Lekki u2netp domyślnie; pełny u2net przy ustawieniu jakości 'high'."""
+        processing_settings = self.settings.get('processing', {})
+        if processing_settings.get('model'):
+            return processing_settings['model']
+        return 'u2net' if processing_settings.get('quality') == 'high' else 'u2netp'
+
+    def _rembg_array(self, img_array):
+        """Maska z rembg liczona na obrazie w natywnym rozmiarze modelu, alpha skalowana z powrotem."""
+        model_name = self._rembg_model_name()
+        session = _get_rembg_session(model_name)
+        input_size = _MODEL_INPUT_SIZE.get(model_name)
+        if input_size is None:
+            return rembg_remove(img_array, session=session)
+        
+        height, width = img_array.shape[:2]
+        small = cv2.resize(img_array, (input_size, input_size), interpolation=cv2.INTER_AREA)
+        mask = np.asarray(rembg_remove(small, session=session, only_mask=True))
+        if mask.ndim == 3:
+            mask = mask[:, :, 0]
+        alpha = cv2.resize(mask, (width, height), interpolation=cv2.INTER_LINEAR)
+        return np.dstack((img_array, alpha))
+
+    def _simple_background_array(self, image):
+        """simple_background_removal jako tablica RGBA (fallback może zwrócić obraz RGB)."""
+        result = self.simple_background_removal(image)
+        if result.mode != 'RGBA':
+            result = result.convert('RGBA')
+        return np.asarray(result)
 
     def simple_background_removal(self, image):
         """Prosta metoda usuwania tła bez rembg."""
         try:
-            # Konwertuj do OpenCV
-            img_array = np.array(image)
-            if img_array.shape[2] == 4:  # RGBA
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            # Konwertuj do OpenCV (grabCut potrzebuje 3 kanałów - bez kopii przez cvtColor)
+            img_array = np.asarray(image)
+            rgb = np.ascontiguousarray(img_array[:, :, :3])
+            
+            # grabCut jest O(piksele * iteracje) - licz maskę na zmniejszonej kopii
+            height, width = rgb.shape[:2]
+            scale = GRABCUT_MAX_SIDE / max(height, width)
+            if scale < 1:
+                small = cv2.resize(rgb, (max(1, int(width * scale)), max(1, int(height * scale))),
+                                   interpolation=cv2.INTER_AREA)
+            else:
+                small = rgb
             
             # Tworzenie maski (bardzo proste - może nie działać idealnie)
-            mask = np.zeros(img_array.shape[:2], np.uint8)
-            bgd_model = np.zeros((1, 65), np.float64)
-            fgd_model = np.zeros((1, 65), np.float64)
-            
-            height, width = img_array.shape[:2]
-            # Prostokąt zakładający że obiekt jest w środku
-            rectangle = (int(width*0.1), int(height*0.1), int(width*0.9), int(height*0.9))
-            
-            cv2.grabCut(img_array, mask, rectangle, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
-            mask2 = np.where((mask == 2) | (mask == 0), 0, 1).astype('uint8')
-            
-            # Zastosuj maskę
-            result = img_array * mask2[:, :, np.newaxis]
+            small_h, small_w = small.shape[:2]
+            
+            # Prostokąt (x, y, szerokość, wysokość) zakładający że obiekt jest w środku
+            x, y = int(small_w*0.1), int(small_h*0.1)
+            rect_w, rect_h = int(small_w*0.8), int(small_h*0.8)
+            
+            mask2 = None
+            if self._grabcut_models is not None:
+                # Modele GMM z poprzedniego obrazu partii (np. to samo studyjne tło) -
+                # maska z prostokąta i jedna iteracja zamiast uczenia od zera
+                bgd_model, fgd_model = (model.copy() for model in self._grabcut_models)
+                mask = np.full((small_h, small_w), cv2.GC_BGD, np.uint8)
+                mask[y:y + rect_h, x:x + rect_w] = cv2.GC_PR_FGD
+                cv2.grabCut(small, mask, None, bgd_model, fgd_model, 1, cv2.GC_EVAL)
+                mask2 = np.where((mask == 2) | (mask == 0), 0, 1).astype('uint8')
+                if not self._grabcut_mask_ok(mask2):
+                    mask2 = None
+            
+            if mask2 is None:
+                mask = np.zeros((small_h, small_w), np.uint8)
+                bgd_model = np.zeros((1, 65), np.float64)
+                fgd_model = np.zeros((1, 65), np.float64)
+                cv2.grabCut(small, mask, (x, y, rect_w, rect_h), bgd_model, fgd_model,
+                            GRABCUT_ITERATIONS, cv2.GC_INIT_WITH_RECT)
+                mask2 = np.where((mask == 2) | (mask == 0), 0, 1).astype('uint8')
+            
+            if self._grabcut_mask_ok(mask2):
+                self._grabcut_models = (bgd_model, fgd_model)
+            if scale < 1:
+                mask2 = cv2.resize(mask2, (width, height), interpolation=cv2.INTER_NEAREST)
+            
+            # Zastosuj maskę w pełnej rozdzielczości
+            result = rgb * mask2[:, :, np.newaxis]
             
             # Dodaj kanał alpha
             alpha = mask2 * 255
@@ -246,11 +473,18 @@ class ProcessingThread(QThread):
             # Fallback - zwróć oryginalny obraz
             return image
 
+    @staticmethod
+    def _grabcut_mask_ok(mask):
+        """Odrzuca zdegenerowane maski (prawie pusty lub prawie pełny obiekt)."""
+        foreground = float(mask.mean())
+        return GRABCUT_MIN_FOREGROUND <= foreground <= 1 - GRABCUT_MIN_FOREGROUND
+
     def replace_background(self, image):
         """Zamienia tło obrazu."""
         try:
-            # Najpierw usuń tło
-            no_bg_image = self.remove_background(image)
+            # Najpierw usuń tło - dalej pracujemy na tablicach numpy
+            rgba = self._remove_background_array(image)
+            height, width = rgba.shape[:2]
             
             processing_settings = self.settings.get('processing', {})
             
@@ -260,29 +494,44 @@ class ProcessingThread(QThread):
                 bg_color = processing_settings.get('bg_color', '#FFFFFF')
                 if bg_color.startswith('#'):
                     # Konwertuj hex na RGB
-                    bg_color = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5))
+                    bg_color = _hex_to_rgb(bg_color)
                 
-                # Utwórz tło
-                background = Image.new('RGBA', image.size, bg_color + (255,))
+                # Jednolity kolor - rozgłaszany, bez tworzenia pełnowymiarowego tła
+                background = np.array(bg_color[:3], dtype=np.float32)
             else:
                 # Obraz tła
                 bg_image_path = processing_settings.get('bg_image')
                 if bg_image_path and os.path.exists(bg_image_path):
-                    background = Image.open(bg_image_path)
-                    background = background.resize(image.size, Image.Resampling.LANCZOS)
-                    background = background.convert('RGBA')
+                    with Image.open(bg_image_path) as bg_image:
+                        bg_image = bg_image.convert('RGB').resize((width, height), Image.Resampling.LANCZOS)
+                    background = np.asarray(bg_image, dtype=np.float32)
                 else:
                     # Fallback na biały
-                    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
-            
-            # Połącz obrazy
-            background.paste(no_bg_image, mask=no_bg_image.split()[3])
-            return background
+                    background = np.array((255, 255, 255), dtype=np.float32)
+            
+            # Połącz obrazy jednym przebiegiem: bg + (fg - bg) * alpha
+            alpha = rgba[:, :, 3:4].astype(np.float32)
+            alpha *= 1 / 255
+            result = rgba[:, :, :3].astype(np.float32)
+            result -= background
+            result *= alpha
+            result += background
+            result += 0.5
+            return Image.fromarray(result.astype(np.uint8), 'RGB')
             
         except Exception as e:
             print(f"DEBUG: Error in replace_background: {str(e)}")
             return image
 
+    def _marketplace_spec(self):
+        """Specyfikacja pierwszego wybranego marketplace albo None, gdy obraz nie jest przygotowywany."""
+        if not self.settings.get('prepare_for_sale', False):
+            return None
+        marketplaces = self.settings.get('marketplaces', [])
+        if not marketplaces:
+            return None
+        return _MARKETPLACE_SPECS.get(marketplaces[0], _DEFAULT_MARKETPLACE_SPEC)
+
     def prepare_for_marketplace(self, image):
         """Przygotowuje obraz dla wybranych marketplace."""
         try:
@@ -294,25 +543,27 @@ class ProcessingThread(QThread):
             marketplace = marketplaces[0]
             print(f"DEBUG: Preparing for marketplace: {marketplace}")
             
-            # Specyfikacje marketplace
-            specs = {
-                'Amazon': {'size': (2000, 2000), 'bg_color': (255, 255, 255)},
-                'eBay': {'size': (1600, 1600), 'bg_color': (255, 255, 255)},
-                'Etsy': {'size': (2000, 2000), 'bg_color': (255, 255, 255)},
-                'Allegro': {'size': (1600, 1600), 'bg_color': (255, 255, 255)},
-                'Shopify': {'size': (2048, 2048), 'bg_color': (255, 255, 255)},
-                'WeChat': {'size': (800, 800), 'bg_color': (255, 255, 255)}
-            }
-            
-            spec = specs.get(marketplace, {'size': (1600, 1600), 'bg_color': (255, 255, 255)})
+            spec = _MARKETPLACE_SPECS.get(marketplace, _DEFAULT_MARKETPLACE_SPEC)
             target_size = spec['size']
             bg_color = spec['bg_color']
             
-            # Zmień rozmiar zachowując proporcje
-            image.thumbnail(target_size, Image.Resampling.LANCZOS)
-            
-            # Utwórz nowe tło o docelowym rozmiarze
-            new_image = Image.new('RGBA', target_size, bg_color + (255,))
+            # Zmień rozmiar zachowując proporcje (tylko zmniejszanie, jak thumbnail)
+            width, height = image.size
+            scale = min(target_size[0] / width, target_size[1] / height)
+            if scale < 1:
+                new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+                # reducing_gap: najpierw tanie zmniejszenie blokowe, LANCZOS tylko na końcówce
+                image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            
+            # Tło o docelowym rozmiarze - alokowane raz na partię, potem tylko czyszczone.
+            # Zwracane przez referencję: zapis konsumuje je przed kolejnym obrazem.
+            fill = bg_color + (255,)
+            if self._mp_canvas is None or self._mp_canvas_key != (target_size, bg_color):
+                self._mp_canvas = Image.new('RGBA', target_size, fill)
+                self._mp_canvas_key = (target_size, bg_color)
+            else:
+                self._mp_canvas.paste(fill, (0, 0, target_size[0], target_size[1]))
+            new_image = self._mp_canvas
             
             # Wycentruj obraz
             x = (target_size[0] - image.width) // 2
@@ -349,46 +600,73 @@ class ProcessingThread(QThread):
             output_filename = f"{original_name}_processed{extension}"
             output_path = os.path.join(output_dir, output_filename)
             
-            # Jeśli plik istnieje, dodaj numer
+            # Jeśli plik istnieje, dodaj numer. Plik zakładany atomowo ('xb') - procesy robocze
+            # działają równolegle, a sprawdzenie os.path.exists dałoby dwóm tę samą nazwę
             counter = 1
-            while os.path.exists(output_path):
-                output_filename = f"{original_name}_processed_{counter}{extension}"
-                output_path = os.path.join(output_dir, output_filename)
-                counter += 1
+            while True:
+                try:
+                    output_file = open(output_path, 'xb')
+                    break
+                except FileExistsError:
+                    output_filename = f"{original_name}_processed_{counter}{extension}"
+                    output_path = os.path.join(output_dir, output_filename)
+                    counter += 1
             
             # Przygotuj obraz do zapisu
             save_image = image
             if output_format.upper() == 'JPEG':
                 # JPEG nie obsługuje przezroczystości
-                if image.mode in ('RGBA', 'LA'):
+                if image.mode == 'RGBA':
+                    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+                    save_image = Image.alpha_composite(background, image).convert('RGB')
+                elif image.mode == 'LA':
                     background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'RGBA':
-                        background.paste(image, mask=image.split()[3])
-                    else:
-                        background.paste(image)
+                    background.paste(image)
                     save_image = background
             
-            # Zapisz
+            # Zapisz - ustawienia enkodera nastawione na szybkość (jeden przebieg)
             save_kwargs = {'format': output_format}
-            if output_format.upper() in ['JPEG', 'WEBP']:
-                save_kwargs['quality'] = quality
-            if output_format.upper() == 'PNG':
-                save_kwargs['optimize'] = True
+            fmt = output_format.upper()
+            if fmt == 'JPEG':
+                save_kwargs.update(quality=quality, subsampling=2, optimize=False, progressive=False)
+            elif fmt == 'PNG':
+                save_kwargs['compress_level'] = self.settings.get('format', {}).get('png_level', 1)
+            elif fmt == 'WEBP':
+                save_kwargs.update(quality=quality, method=2)
             
-            save_image.save(output_path, **save_kwargs)
+            try:
+                with output_file:
+                    save_image.save(output_file, **save_kwargs)
+            except Exception:
+                # Nie zostawiaj pustego, zarezerwowanego pliku
+                os.remove(output_path)
+                raise
             print(f"DEBUG: Saved: {output_path}")
+            
+            # Dodatkowa optymalizacja rozmiaru tylko na życzenie użytkownika
+            if self.settings.get('postprocess', False):
+                self.postprocess_output(output_path, fmt)
             return output_path
             
         except Exception as e:
             print(f"DEBUG: Error saving image: {str(e)}")
             return None
 
-    def pause(self):
-        self.is_paused = True
-
-    def resume(self):
-        self.is_paused = False
-
-    def stop(self):
-        print("DEBUG: ProcessingThread.stop() called")
-        self.is_running = False
\ No newline at end of file
+    def postprocess_output(self, output_path, fmt):
+        """Optymalizuje zapisany plik zewnętrznym narzędziem (optipng/jpegoptim), jeśli jest dostępne."""
+        commands = {
+            'PNG': ('optipng', ['-o2', '-quiet']),
+            'JPEG': ('jpegoptim', ['--strip-all', '--quiet']),
+        }
+        if fmt not in commands:
+            return
+        tool, args = commands[fmt]
+        tool_path = shutil.which(tool)
+        if not tool_path:
+            print(f"DEBUG: {tool} not available, skipping postprocess")
+            return
+        try:
+            subprocess.run([tool_path, *args, output_path], check=False, timeout=120,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"DEBUG: Postprocess with {tool} failed: {str(e)}")
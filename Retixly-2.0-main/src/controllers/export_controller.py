@@ -1,17 +1,127 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QCoreApplication, pyqtSignal
 import os
+import io
+import re
 import csv
-import xml.etree.ElementTree as ET
+import mimetypes
+from xml.sax.saxutils import XMLGenerator
 from datetime import datetime
+import threading
+import queue
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from google.oauth2.credentials import Credentials
 from google.oauth2.service_account import ServiceAccountCredentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
 from ftplib import FTP
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
 
+# aiohttp jest opcjonalny - bez niego imgBB używa puli wątków
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Domyślna liczba równoległych wysyłek (ustawienie 'concurrency')
+DEFAULT_EXPORT_CONCURRENCY = 8
+# FTP/SFTP: serwery często limitują połączenia z jednego IP - osobny, niski domyślny limit ('ftp_connections')
+DEFAULT_FTP_CONNECTIONS = 2
+
+# Znaczniki wzorca nazwy pliku - podmieniane jednym przejściem
+FILENAME_TOKEN_RE = re.compile(r'\{(original_name|timestamp|size)\}')
+
+# Google Drive: mniejsze pliki jednym żądaniem, większe wznawialnie w dużych kawałkach
+GDRIVE_RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+GDRIVE_CHUNK_SIZE = 16 * 1024 * 1024
+
+IMGBB_UPLOAD_URL = 'https://api.imgbb.com/1/upload'
+
+# Pula połączeń S3 większa niż domyślne 10 - inaczej równoległe wysyłki czekają na gniazdo
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Typ MIME z rozszerzenia nazwy pliku (Image.MIME zna tylko formaty, których wtyczka została już wczytana);
+# .webp nie ma w tabeli mimetypes starszych Pythonów
+mimetypes.add_type('image/webp', '.webp')
+
+# Liczba buforów BytesIO trzymanych do ponownego użycia między wysyłkami
+BUFFER_POOL_SIZE = 16
+
+def _save_image_to(buffer, image, format_type, quality=85, optimize=False):
+    """Zapisuje obraz w danym formacie do podanego strumienia."""
+    if format_type.upper() == 'JPEG' and image.mode in ('RGBA', 'LA', 'P'):
+        # JPEG nie obsługuje przezroczystości - spłaszczenie na białe tło
+        # (alpha_composite w C, bez split() alokującego osobny obraz na każdy kanał)
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image).convert('RGB')
+        
+    save_kwargs = {'format': format_type}
+    if format_type.upper() in ('JPEG', 'WEBP'):
+        save_kwargs['quality'] = quality
+    if optimize and format_type.upper() == 'JPEG':
+        save_kwargs['optimize'] = True
+        
+    image.save(buffer, **save_kwargs)
+
+class _CsvLinksWriter:
+    """Strumieniowy zapis pliku CSV z linkami - wiersz po każdym wyeksportowanym obrazie."""
+    
+    def __init__(self, output_path):
+        self._file = open(output_path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['Original Name', 'Export URL'])
+        
+    def write(self, image_data):
+        self._writer.writerow([
+            os.path.basename(image_data['original_path']),
+            image_data['export_path']
+        ])
+        
+    def close(self):
+        self._file.close()
+
+class _XmlLinksWriter:
+    """Strumieniowy zapis pliku XML z linkami - bez budowania całego drzewa w pamięci."""
+    
+    def __init__(self, output_path, timestamp):
+        self._file = open(output_path, 'w', encoding='utf-8')
+        self._xml = XMLGenerator(self._file, encoding='utf-8')
+        self._xml.startDocument()
+        self._xml.startElement('images', {'generated': timestamp})
+        
+    def write(self, image_data):
+        self._xml.startElement('image', {})
+        self._text_element('original_name', os.path.basename(image_data['original_path']))
+        self._text_element('export_url', image_data['export_path'])
+        self._xml.endElement('image')
+        
+    def _text_element(self, name, text):
+        self._xml.startElement(name, {})
+        self._xml.characters(text or '')
+        self._xml.endElement(name)
+        
+    def close(self):
+        self._xml.endElement('images')
+        self._xml.endDocument()
+        self._file.close()
+
 class ExportController(QObject):
     export_progress = pyqtSignal(int, str)
     export_complete = pyqtSignal()
@@ -20,6 +130,58 @@ class ExportController(QObject):
     def __init__(self, settings_controller):
         super().__init__()
         self.settings = settings_controller
+        # Klienci S3 współdzieleni przez wątki eksportu: (key_id, region, bucket) -> klient
+        self._s3_clients = {}
+        self._s3_lock = threading.Lock()
+        
+        # Usługa Google Drive na wątek (klient httplib2 nie jest bezpieczny wątkowo), odnawiana co partię
+        self._gdrive_local = threading.local()
+        
+        # Bufory kodowania na miejscu używane ponownie (mniej dużych, krótko żyjących alokacji)
+        self._buf_pool = queue.LifoQueue(maxsize=BUFFER_POOL_SIZE)
+        
+        # Otwarty plik z linkami bieżącego eksportu (wiersze dopisywane po każdej wysyłce)
+        self._links_writer = None
+        
+        # Znacznik czasu bieżącej partii (jeden dla wszystkich nazw plików)
+        self._batch_ts = None
+        
+        # Backend eksportu według nieprzetłumaczonego identyfikatora typu (export_settings['type'])
+        self._handlers = {
+            'Local Folder': self.export_local,
+            'Google Drive': self.export_gdrive,
+            'Amazon S3': self.export_s3,
+            'FTP': self.export_ftp,
+            'imgBB': self.export_imgbb,
+        }
+        # Zgodność wstecz: ustawienia zapisane z przetłumaczoną nazwą folderu lokalnego
+        self._handlers.setdefault(self.tr("Local Folder"), self.export_local)
+        self._progress_template = self.tr("Exporting image {0} of {1}...")
+        
+        # Sesja HTTP z pulą połączeń (keep-alive) dla wysyłek imgBB.
+        # POST nie jest ponawiany po odpowiedzi 5xx (obraz mógł już zostać zapisany - duplikat);
+        # ponawiane są tylko błędy nawiązania połączenia, gdy żądanie nie dotarło do serwera
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=5,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self._http.mount('https://', adapter)
+        
+        # Zamknięcie sesji HTTP przy wyjściu z aplikacji
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+        
+    def close(self):
+        """Zamyka sesję HTTP."""
+        self._http.close()
         
     def get_gdrive_credentials(self):
         """Zwraca ważne poświadczenia Google Drive lub podnosi wyjątek, gdy wymagane jest logowanie OAuth2."""
@@ -45,34 +207,139 @@ class ExportController(QObject):
         try:
             export_type = export_settings['type']
             total_images = len(images)
+            self._batch_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self._gdrive_local = threading.local()
             
-            for i, image_data in enumerate(images, 1):
-                progress = (i / total_images) * 100
-                self.export_progress.emit(
-                    progress,
-                    self.tr(f"Exporting image {i} of {total_images}...")
-                )
+            export_fn = self._handlers.get(export_type)
                 
-                if export_type == self.tr("Local Folder"):
-                    self.export_local(image_data, export_settings)
-                elif export_type == "Google Drive":
-                    self.export_gdrive(image_data, export_settings)
-                elif export_type == "Amazon S3":
-                    self.export_s3(image_data, export_settings)
-                elif export_type == "FTP":
-                    self.export_ftp(image_data, export_settings)
-                elif export_type == "imgBB":
-                    self.export_imgbb(image_data, export_settings)
-                    
-            # Generowanie pliku z linkami
+            # Plik z linkami otwierany przed eksportem i uzupełniany na bieżąco
             if export_settings['generate_links'] != self.tr("Don't generate links file"):
-                self.generate_links_file(images, export_settings)
+                self._links_writer = self._open_links_writer(export_settings, self._batch_ts)
+                
+            try:
+                if export_fn is not None and total_images:
+                    # Kodowanie odbywa się w wątkach wysyłki - enkodery Pillow zwalniają GIL
+                    self._dispatch_export(export_fn, images, export_settings)
+                else:
+                    for image_data in images:
+                        self._record_link(image_data)
+            finally:
+                if self._links_writer is not None:
+                    self._links_writer.close()
+                    self._links_writer = None
                 
             self.export_complete.emit()
             
         except Exception as e:
             self.error_occurred.emit(str(e))
             
+    def _dispatch_export(self, export_fn, images, export_settings):
+        """Wybiera sposób równoległego eksportu dla backendu."""
+        if export_fn == self.export_ftp:
+            self._export_ftp_batch(images, export_settings)
+        elif export_fn == self.export_imgbb and HAS_AIOHTTP:
+            # imgBB to czyste HTTP - setki wysyłek multipleksowane w jednej pętli asyncio
+            asyncio.run(self._export_imgbb_async(images, export_settings))
+        else:
+            self._export_concurrently(export_fn, images, export_settings)
+                
+    def _export_concurrently(self, export_fn, images, export_settings, concurrency=None):
+        """Uruchamia eksport w puli wątków i raportuje postęp w kolejności ukończenia."""
+        total_images = len(images)
+        # Wysyłka jest ograniczona opóźnieniem sieci - kilka plików naraz
+        if concurrency is None:
+            concurrency = export_settings.get('concurrency', DEFAULT_EXPORT_CONCURRENCY)
+        max_workers = max(1, min(concurrency, total_images))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(export_fn, image_data, export_settings): image_data
+                       for image_data in images}
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    self._record_link(futures[future])
+                    progress = (i / total_images) * 100
+                    self.export_progress.emit(
+                        progress,
+                        self._progress_template.format(i, total_images)
+                    )
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+                
+    async def _export_imgbb_async(self, images, settings):
+        """Wysyła obrazy do imgBB przez aiohttp, najwyżej 'concurrency' żądań naraz."""
+        total_images = len(images)
+        limit = max(1, settings.get('concurrency', DEFAULT_EXPORT_CONCURRENCY))
+        semaphore = asyncio.Semaphore(limit)
+        loop = asyncio.get_running_loop()
+        format_type = settings.get('format', {}).get('type', 'JPEG')
+        quality = settings.get('format', {}).get('quality', 85)
+        
+        async def upload_one(session, image_data):
+            async with semaphore:
+                try:
+                    # Kodowanie obciąża CPU - poza pętlą zdarzeń
+                    buffer = await loop.run_in_executor(
+                        None, self._buffer_for, image_data, format_type, quality, True
+                    )
+                    data = buffer.getvalue()
+                    self._release_buf(buffer)
+                    form = aiohttp.FormData()
+                    form.add_field('image', data,
+                                   filename=self._imgbb_upload_name(image_data, format_type))
+                    async with session.post(IMGBB_UPLOAD_URL, params={'key': settings['api_key']},
+                                            data=form) as response:
+                        response.raise_for_status()
+                        response_data = await response.json(content_type=None)
+                    self._apply_imgbb_response(image_data, response_data)
+                    return image_data
+                except Exception as e:
+                    raise Exception(f"imgBB export failed: {str(e)}")
+        
+        connector = aiohttp.TCPConnector(limit=limit)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = [asyncio.ensure_future(upload_one(session, image_data)) for image_data in images]
+            try:
+                for i, task in enumerate(asyncio.as_completed(tasks), 1):
+                    self._record_link(await task)
+                    progress = (i / total_images) * 100
+                    self.export_progress.emit(
+                        progress,
+                        self._progress_template.format(i, total_images)
+                    )
+            except Exception:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+                
+    def _get_buf(self):
+        """Pusty bufor z puli (lub nowy, gdy pula jest pusta)."""
+        try:
+            buffer = self._buf_pool.get_nowait()
+        except queue.Empty:
+            return io.BytesIO()
+        buffer.seek(0)
+        return buffer
+        
+    def _release_buf(self, buffer):
+        """Oddaje bufor do puli po zakończonej wysyłce."""
+        try:
+            self._buf_pool.put_nowait(buffer)
+        except queue.Full:
+            pass
+            
+    def _buffer_for(self, image_data, format_type, quality, optimize=False):
+        """Bufor z obrazem zakodowanym na miejscu (w wątku wysyłki)."""
+        buffer = self._get_buf()
+        _save_image_to(buffer, image_data['image'], format_type, quality, optimize)
+        # Obcięcie dopiero po zapisie - truncate(0) przed zapisem zwolniłoby pamięć bufora
+        buffer.truncate()
+        buffer.seek(0)
+        return buffer
+        
     def export_local(self, image_data, settings):
         """Eksport do lokalnego folderu."""
         output_path = os.path.join(
@@ -82,42 +349,74 @@ class ExportController(QObject):
         image_data['image'].save(output_path)
         image_data['export_path'] = output_path
         
+    def _gdrive_service(self):
+        """Usługa Drive dla bieżącego wątku - discovery i poświadczenia raz na wątek, nie na plik."""
+        service = getattr(self._gdrive_local, 'service', None)
+        if service is None:
+            credentials = self.get_gdrive_credentials()
+            service = build('drive', 'v3', credentials=credentials, cache_discovery=False)
+            self._gdrive_local.service = service
+        return service
+        
     def export_gdrive(self, image_data, settings):
         """Eksport do Google Drive."""
         try:
-            credentials = self.get_gdrive_credentials()
-            service = build('drive', 'v3', credentials=credentials)
+            service = self._gdrive_service()
             
             # Przygotowanie pliku
+            filename = self.generate_filename(image_data, settings)
             file_metadata = {
-                'name': self.generate_filename(image_data, settings),
+                'name': filename,
                 'parents': [settings['folder_id']]
             }
             
-            # Tymczasowy zapis pliku
-            temp_path = os.path.join(
-                os.path.dirname(image_data['original_path']),
-                'temp_' + os.path.basename(image_data['original_path'])
-            )
-            image_data['image'].save(temp_path)
+            # Zakodowanie obrazu w pamięci (bez pliku tymczasowego)
+            format_type = settings['format']['type']
+            buffer = self._buffer_for(image_data, format_type, settings['format'].get('quality', 85))
             
             # Upload do Google Drive
-            media = MediaFileUpload(temp_path, resumable=True)
-            file = service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, webViewLink'
-            ).execute()
+            try:
+                media = MediaIoBaseUpload(
+                    buffer,
+                    mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                    resumable=buffer.getbuffer().nbytes > GDRIVE_RESUMABLE_THRESHOLD,
+                    chunksize=GDRIVE_CHUNK_SIZE
+                )
+                file = service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id, webViewLink'
+                ).execute()
+            finally:
+                self._release_buf(buffer)
             
             # Zapisanie linku
             image_data['export_path'] = file.get('webViewLink')
             
-            # Usunięcie pliku tymczasowego
-            os.remove(temp_path)
-            
         except Exception as e:
             raise Exception(f"Google Drive export failed: {str(e)}")
             
+    def _s3_client(self, settings):
+        """Wspólny klient S3 dla danych dostępowych (klienci boto3 są bezpieczni wątkowo).
+
+        Dostęp do bucketu sprawdzany jest raz, przy tworzeniu klienta.
+        """
+        key = (settings['key_id'], settings['region'], settings['bucket'])
+        with self._s3_lock:
+            client = self._s3_clients.get(key)
+            if client is None:
+                client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings['key_id'],
+                    aws_secret_access_key=settings['secret'],
+                    region_name=settings['region'],
+                    config=S3_CLIENT_CONFIG
+                )
+                # Test połączenia z bucketem
+                client.head_bucket(Bucket=settings['bucket'])
+                self._s3_clients[key] = client
+            return client
+            
     def export_s3(self, image_data, settings):
         """Eksport do Amazon S3."""
         try:
@@ -127,98 +426,118 @@ class ExportController(QObject):
             if missing_params:
                 raise Exception(f"Missing S3 parameters: {', '.join(missing_params)}")
 
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=settings['key_id'],
-                aws_secret_access_key=settings['secret'],
-                region_name=settings['region']
-            )
-            
-            # Test połączenia z bucketem
-            s3.head_bucket(Bucket=settings['bucket'])
+            s3 = self._s3_client(settings)
             
             # Przygotowanie pliku
             filename = self.generate_filename(image_data, settings)
-            temp_path = os.path.join(
-                os.path.dirname(image_data['original_path']),
-                'temp_' + filename
-            )
-            image_data['image'].save(temp_path)
+            buffer = self._buffer_for(image_data, settings['format']['type'],
+                                      settings['format'].get('quality', 85))
             
             # Upload do S3
-            s3.upload_file(
-                temp_path,
-                settings['bucket'],
-                filename
-            )
+            try:
+                s3.upload_fileobj(
+                    buffer,
+                    settings['bucket'],
+                    filename,
+                    Config=S3_TRANSFER_CONFIG
+                )
+            finally:
+                self._release_buf(buffer)
             
             # Generowanie URL
             url = f"https://{settings['bucket']}.s3.amazonaws.com/{filename}"
             image_data['export_path'] = url
             
-            # Usunięcie pliku tymczasowego
-            os.remove(temp_path)
-            
         except Exception as e:
             raise Exception(f"S3 export failed: {str(e)}")
             
-    def export_ftp(self, image_data, settings):
-        """Eksport przez FTP."""
+    def _ftp_connect(self, settings):
+        """Otwiera połączenie FTP lub SFTP i przechodzi do katalogu docelowego."""
+        if settings.get('use_sftp', False):
+            import paramiko
+            transport = paramiko.Transport((settings['host'], settings.get('port', 22)))
+            transport.connect(username=settings['user'], password=settings['password'])
+            sftp = paramiko.SFTPClient.from_transport(transport)
+            # Przejście do docelowego katalogu
+            if settings['path']:
+                try:
+                    sftp.chdir(settings['path'])
+                except IOError:
+                    sftp.mkdir(settings['path'])
+                    sftp.chdir(settings['path'])
+            return sftp
+            
+        ftp = FTP(settings['host'])
+        ftp.login(settings['user'], settings['password'])
+        if settings['path']:
+            ftp.cwd(settings['path'])
+        return ftp
+        
+    @staticmethod
+    def _ftp_close(conn):
+        """Zamyka połączenie z _ftp_connect (błędy przy zamykaniu są ignorowane)."""
         try:
-            use_sftp = settings.get('use_sftp', False)
-
-            if use_sftp:
-                import paramiko
-                transport = paramiko.Transport((settings['host'], settings.get('port', 22)))
-                transport.connect(username=settings['user'], password=settings['password'])
-                sftp = paramiko.SFTPClient.from_transport(transport)
-                # Przejście do docelowego katalogu
-                if settings['path']:
-                    try:
-                        sftp.chdir(settings['path'])
-                    except IOError:
-                        sftp.mkdir(settings['path'])
-                        sftp.chdir(settings['path'])
-
-                filename = self.generate_filename(image_data, settings)
-                temp_path = os.path.join(
-                    os.path.dirname(image_data['original_path']),
-                    'temp_' + filename
-                )
-                image_data['image'].save(temp_path)
-                sftp.put(temp_path, filename)
-                url = f"sftp://{settings['host']}/{settings['path']}/{filename}"
-                image_data['export_path'] = url
-                sftp.close()
+            if isinstance(conn, FTP):
+                conn.quit()
+            else:
+                transport = conn.get_channel().get_transport()
+                conn.close()
                 transport.close()
+        except Exception:
+            pass
+            
+    def _ftp_put(self, conn, image_data, settings):
+        """Wysyła jeden obraz przez otwarte połączenie FTP/SFTP."""
+        filename = self.generate_filename(image_data, settings)
+        buffer = self._buffer_for(image_data, settings['format']['type'],
+                                  settings['format'].get('quality', 85))
+        
+        # Upload pliku i generowanie URL
+        try:
+            if isinstance(conn, FTP):
+                conn.storbinary(f'STOR {filename}', buffer)
+                image_data['export_path'] = f"ftp://{settings['host']}/{settings['path']}/{filename}"
             else:
-                ftp = FTP(settings['host'])
-                ftp.login(settings['user'], settings['password'])
-                if settings['path']:
-                    ftp.cwd(settings['path'])
-                filename = self.generate_filename(image_data, settings)
-                
-                temp_path = os.path.join(
-                    os.path.dirname(image_data['original_path']),
-                    'temp_' + filename
-                )
-                image_data['image'].save(temp_path)
-                
-                # Upload pliku
-                with open(temp_path, 'rb') as file:
-                    ftp.storbinary(f'STOR {filename}', file)
-                    
-                # Generowanie URL
-                url = f"ftp://{settings['host']}/{settings['path']}/{filename}"
-                image_data['export_path'] = url
-                
-                # Zamknięcie połączenia i usunięcie pliku tymczasowego
-                ftp.quit()
-                os.remove(temp_path)
+                conn.putfo(buffer, filename)
+                image_data['export_path'] = f"sftp://{settings['host']}/{settings['path']}/{filename}"
+        finally:
+            self._release_buf(buffer)
             
+    def export_ftp(self, image_data, settings):
+        """Eksport przez FTP."""
+        try:
+            conn = self._ftp_connect(settings)
+            try:
+                self._ftp_put(conn, image_data, settings)
+            finally:
+                self._ftp_close(conn)
         except Exception as e:
             raise Exception(f"FTP export failed: {str(e)}")
             
+    def _export_ftp_batch(self, images, settings):
+        """Eksport partii przez FTP/SFTP - jedno połączenie na wątek puli, nie na plik."""
+        local = threading.local()
+        connections = []
+        connections_lock = threading.Lock()
+        
+        def upload(image_data, settings):
+            try:
+                conn = getattr(local, 'conn', None)
+                if conn is None:
+                    conn = local.conn = self._ftp_connect(settings)
+                    with connections_lock:
+                        connections.append(conn)
+                self._ftp_put(conn, image_data, settings)
+            except Exception as e:
+                raise Exception(f"FTP export failed: {str(e)}")
+                
+        try:
+            self._export_concurrently(upload, images, settings,
+                                      settings.get('ftp_connections', DEFAULT_FTP_CONNECTIONS))
+        finally:
+            for conn in connections:
+                self._ftp_close(conn)
+            
     def export_imgbb(self, image_data, settings):
         """Eksport obrazu do ImgBB z obsługą formatu, jakości i ulepszonym logowaniem odpowiedzi."""
         try:
@@ -226,58 +545,55 @@ class ExportController(QObject):
             format_type = settings.get('format', {}).get('type', 'JPEG')
             quality = settings.get('format', {}).get('quality', 85)
 
-            # Nazwa tymczasowa
-            temp_path = os.path.join(
-                os.path.dirname(image_data['original_path']),
-                f'temp_{os.path.splitext(os.path.basename(image_data["original_path"]))[0]}.{format_type.lower()}'
-            )
-
-            # Konwersja, jeśli JPEG i obraz ma kanał alfa lub tryb P
-            if format_type.upper() == 'JPEG' and image_data['image'].mode in ('RGBA', 'P'):
-                rgb_image = Image.new('RGB', image_data['image'].size, (255, 255, 255))
-                if image_data['image'].mode == 'RGBA':
-                    rgb_image.paste(image_data['image'], mask=image_data['image'].split()[-1])
-                else:
-                    rgb_image.paste(image_data['image'])
-                rgb_image.save(temp_path, format=format_type, quality=quality, optimize=True)
-            else:
-                save_kwargs = {'format': format_type}
-                if format_type.upper() == 'JPEG':
-                    save_kwargs['quality'] = quality
-                    save_kwargs['optimize'] = True
-                image_data['image'].save(temp_path, **save_kwargs)
+            # Zakodowanie w pamięci (JPEG bez kanału alfa - spłaszczenie na białe tło)
+            buffer = self._buffer_for(image_data, format_type, quality, optimize=True)
 
             # Upload do ImgBB
-            with open(temp_path, 'rb') as file:
-                response = requests.post(
-                    'https://api.imgbb.com/1/upload',
+            try:
+                response = self._http.post(
+                    IMGBB_UPLOAD_URL,
                     params={'key': settings['api_key']},
-                    files={'image': file},
+                    files={'image': (self._imgbb_upload_name(image_data, format_type), buffer.getvalue())},
                     timeout=30
                 )
+            finally:
+                self._release_buf(buffer)
 
             # Walidacja HTTP
             response.raise_for_status()
-            response_data = response.json()
-
-            if response_data.get('success') and 'data' in response_data:
-                image_data['export_path'] = response_data['data']['url']
-                # Dodatkowe informacje przydatne w debugowaniu lub późniejszej obsłudze
-                image_data['delete_url'] = response_data['data'].get('delete_url')
-                image_data['imgbb_id'] = response_data['data'].get('id')
-            else:
-                error_msg = response_data.get('error', {}).get('message', 'Unknown error')
-                raise Exception(f"ImgBB upload failed: {error_msg}")
-
-            # Usunięcie pliku tymczasowego
-            os.remove(temp_path)
+            self._apply_imgbb_response(image_data, response.json())
 
         except Exception as e:
-            # Upewnij się, że tymczasowy plik nie pozostanie
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
             raise Exception(f"imgBB export failed: {str(e)}")
             
+    @staticmethod
+    def _imgbb_upload_name(image_data, format_type):
+        return f'{os.path.splitext(os.path.basename(image_data["original_path"]))[0]}.{format_type.lower()}'
+        
+    @staticmethod
+    def _apply_imgbb_response(image_data, response_data):
+        """Zapisuje wynik wysyłki imgBB w image_data lub podnosi wyjątek z komunikatem API."""
+        if response_data.get('success') and 'data' in response_data:
+            image_data['export_path'] = response_data['data']['url']
+            # Dodatkowe informacje przydatne w debugowaniu lub późniejszej obsłudze
+            image_data['delete_url'] = response_data['data'].get('delete_url')
+            image_data['imgbb_id'] = response_data['data'].get('id')
+        else:
+            error_msg = response_data.get('error', {}).get('message', 'Unknown error')
+            raise Exception(f"ImgBB upload failed: {error_msg}")
+            
+    def _open_links_writer(self, settings, timestamp):
+        """Otwiera strumieniowy zapis pliku z linkami (CSV lub XML) w folderze eksportu."""
+        if settings['generate_links'] == "Generate CSV":
+            return _CsvLinksWriter(os.path.join(settings['path'], f'image_links_{timestamp}.csv'))
+        # XML
+        return _XmlLinksWriter(os.path.join(settings['path'], f'image_links_{timestamp}.xml'), timestamp)
+        
+    def _record_link(self, image_data):
+        """Dopisuje wyeksportowany obraz do otwartego pliku z linkami (wołane w wątku raportującym postęp)."""
+        if self._links_writer is not None:
+            self._links_writer.write(image_data)
+            
     def generate_links_file(self, images, settings):
         """Generuje plik CSV lub XML z linkami do wyeksportowanych obrazów."""
         output_format = settings['generate_links']
@@ -290,59 +606,35 @@ class ExportController(QObject):
             
     def generate_csv(self, images, settings, timestamp):
         """Generuje plik CSV z linkami."""
-        output_path = os.path.join(
-            settings['path'],
-            f'image_links_{timestamp}.csv'
-        )
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Original Name', 'Export URL'])
-            
+        writer = _CsvLinksWriter(os.path.join(settings['path'], f'image_links_{timestamp}.csv'))
+        try:
             for image_data in images:
-                writer.writerow([
-                    os.path.basename(image_data['original_path']),
-                    image_data['export_path']
-                ])
+                writer.write(image_data)
+        finally:
+            writer.close()
                 
     def generate_xml(self, images, settings, timestamp):
         """Generuje plik XML z linkami."""
-        root = ET.Element('images')
-        root.set('generated', timestamp)
-        
-        for image_data in images:
-            image_elem = ET.SubElement(root, 'image')
-            
-            name_elem = ET.SubElement(image_elem, 'original_name')
-            name_elem.text = os.path.basename(image_data['original_path'])
-            
-            url_elem = ET.SubElement(image_elem, 'export_url')
-            url_elem.text = image_data['export_path']
-            
-        tree = ET.ElementTree(root)
-        output_path = os.path.join(
-            settings['path'],
-            f'image_links_{timestamp}.xml'
-        )
-        tree.write(output_path, encoding='utf-8', xml_declaration=True)
+        writer = _XmlLinksWriter(os.path.join(settings['path'], f'image_links_{timestamp}.xml'), timestamp)
+        try:
+            for image_data in images:
+                writer.write(image_data)
+        finally:
+            writer.close()
         
     def generate_filename(self, image_data, settings):
         """Generuje nazwę pliku według wzorca."""
-        pattern = settings['filename_pattern']
         original_name = os.path.splitext(
             os.path.basename(image_data['original_path'])
         )[0]
+        values = {
+            'original_name': original_name,
+            'timestamp': self._batch_ts or datetime.now().strftime('%Y%m%d_%H%M%S'),
+            'size': f"{image_data['image'].width}x{image_data['image'].height}",
+        }
         
-        # Zastąpienie znaczników w wzorcu
-        filename = pattern.replace('{original_name}', original_name)
-        filename = filename.replace(
-            '{timestamp}',
-            datetime.now().strftime('%Y%m%d_%H%M%S')
-        )
-        filename = filename.replace(
-            '{size}',
-            f"{image_data['image'].width}x{image_data['image'].height}"
-        )
+        # Zastąpienie znaczników w wzorcu (jedno przejście, pozostałe nawiasy bez zmian)
+        filename = FILENAME_TOKEN_RE.sub(lambda m: values[m.group(1)], settings['filename_pattern'])
         
         # Dodanie rozszerzenia
         return filename + '.' + settings['format']['type'].lower()
@@ -1,19 +1,68 @@
 import cv2
 import numpy as np
-from PIL import Image, ImageEnhance
-from rembg import remove
+from PIL import Image, ImageEnhance, ImageColor
+from rembg import remove, new_session
 from PyQt6.QtCore import QObject, pyqtSignal
 import os
 
+from ..utils.image_utils import load_image_downscaled
+
+# Obsługa HEIC rejestrowana raz przy imporcie modułu (nie przy każdym wczytaniu)
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:
+    pass
+
+# pyoxipng jest opcjonalny - wielowątkowa optymalizacja zapisanych PNG (ustawienie 'oxipng')
+try:
+    import oxipng
+    HAS_OXIPNG = True
+except ImportError:
+    HAS_OXIPNG = False
+
+# Domyślny poziom kompresji PNG: 6 daje prawie ten sam rozmiar co 9 przy kilkukrotnie krótszym czasie
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+
+# WebP: method 4 to ~3x mniej CPU niż 6 przy ~1% różnicy rozmiaru
+DEFAULT_WEBP_METHOD = 4
+# Grafika płaska (zrzuty ekranu, logo) - próbka z najwyżej tyloma kolorami idzie bezstratnie
+FLAT_IMAGE_SAMPLE_SIZE = (128, 128)
+FLAT_IMAGE_MAX_COLORS = 256
+
+# Luminancja (ITU-R 601) i filtr SMOOTH z PIL - jak w ImageEnhance.Contrast/Color/Sharpness
+LUMA_WEIGHTS = np.array((0.299, 0.587, 0.114), dtype=np.float32)
+SMOOTH_KERNEL = np.array(((1, 1, 1), (1, 5, 1), (1, 1, 1)), dtype=np.float32) / 13
+
 class ImageProcessor(QObject):
     processing_progress = pyqtSignal(int, str)
     processing_complete = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, rembg_model='u2net', providers=None):
         super().__init__()
         self.current_image = None
         self.processed_image = None
+        # Sesja rembg (model ONNX) tworzona przy pierwszym usuwaniu tła i używana ponownie
+        self.rembg_model = rembg_model
+        self.providers = providers
+        self._rembg_session = None
+        
+    def get_rembg_session(self):
+        """Zwraca sesję rembg; bez jawnych providers wybiera CUDA/DirectML, jeśli są dostępne."""
+        if self._rembg_session is None:
+            providers = self.providers
+            if providers is None:
+                providers = ['CPUExecutionProvider']
+                try:
+                    import onnxruntime
+                    available = onnxruntime.get_available_providers()
+                    providers = [p for p in ('CUDAExecutionProvider', 'DmlExecutionProvider',
+                                             'CPUExecutionProvider') if p in available] or providers
+                except ImportError:
+                    pass
+            self._rembg_session = new_session(self.rembg_model, providers=providers)
+        return self._rembg_session
         
     def process_image(self, image_path, settings):
         """Przetwarza pojedyncze zdjęcie zgodnie z ustawieniami."""
@@ -46,66 +95,103 @@ class ImageProcessor(QObject):
             return False
             
     def load_image(self, image_path):
-        """Wczytuje obraz z obsługą różnych formatów."""
-        if image_path.lower().endswith('.heic'):
-            # Obsługa formatu HEIC
-            from pillow_heif import register_heif_opener
-            register_heif_opener()
-            
+        """Wczytuje obraz z obsługą różnych formatów (HEIC przez pillow_heif zarejestrowany przy imporcie)."""
         image = Image.open(image_path)
-        if image.mode != 'RGBA':
+        # RGB/RGBA zostają w natywnym trybie - RGBA tworzą dopiero operacje, które go potrzebują
+        # (remove_background, apply_background, apply_watermark); oszczędza kopię W*H*4 na wczytanie
+        if image.mode in ('RGB', 'RGBA'):
+            image.load()
+        else:
             image = image.convert('RGBA')
         return image
         
     def remove_background(self, image):
         """Usuwa tło ze zdjęcia używając rembg."""
-        # Konwersja do formatu obsługiwanego przez rembg
-        img_array = np.array(image)
+        # Konwersja do formatu obsługiwanego przez rembg (model nie potrzebuje kanału alfa)
+        img_array = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
         # Usunięcie tła
-        result = remove(img_array)
+        result = remove(img_array, session=self.get_rembg_session())
         return Image.fromarray(result)
         
     def apply_background(self, image, background_settings):
         """Nakłada nowe tło zgodnie z ustawieniami."""
         bg_type = background_settings.get('type', 'color')
+        fg = np.asarray(image if image.mode == 'RGBA' else image.convert('RGBA'))
+        height, width = fg.shape[:2]
         
         if bg_type == 'color':
-            # Tworzenie tła o jednolitym kolorze
+            # Jednolity kolor - wektor rozgłaszany na cały obraz, bez alokacji pełnego tła
             bg_color = background_settings.get('color', (255, 255, 255))
-            bg = Image.new('RGBA', image.size, bg_color)
+            if isinstance(bg_color, str):
+                bg_color = ImageColor.getcolor(bg_color, 'RGBA')
+            elif len(bg_color) == 3:
+                bg_color = tuple(bg_color) + (255,)
+            bg = np.array(bg_color, dtype=np.float32)
         else:
-            # Wczytanie i dopasowanie obrazu tła
+            # Wczytanie i dopasowanie obrazu tła (OpenCV - szybsze skalowanie niż PIL)
             bg_path = background_settings.get('image_path')
-            bg = Image.open(bg_path)
-            bg = bg.resize(image.size, Image.Resampling.LANCZOS)
+            with Image.open(bg_path) as bg_image:
+                bg = np.asarray(bg_image.convert('RGBA'))
+            bg = cv2.resize(bg, (width, height), interpolation=cv2.INTER_LANCZOS4).astype(np.float32)
             
-        # Połączenie tła z obrazem
-        bg.paste(image, mask=image.split()[3])
-        return bg
+        # Połączenie tła z obrazem: bg + (fg - bg) * alpha (jak paste z maską alfa)
+        alpha = fg[:, :, 3:4].astype(np.float32)
+        alpha *= 1 / 255
+        out = fg.astype(np.float32)
+        out -= bg
+        out *= alpha
+        out += bg
+        out += 0.5
+        return Image.fromarray(out.astype(np.uint8), 'RGBA')
         
     def apply_retouch(self, image, retouch_settings):
         """Aplikuje ustawienia retuszu."""
-        # Tworzenie kopii obrazu do modyfikacji
-        enhanced = image.copy()
+        keys = ('brightness', 'contrast', 'sharpness', 'color')
+        if not any(key in retouch_settings for key in keys):
+            return image.copy()
+        
+        # Jedna konwersja do float32 i wszystkie ulepszenia na tej samej tablicy
+        # (zamiast osobnego obrazu PIL dla każdego ImageEnhance); kanał alfa bez zmian
+        source = image if image.mode in ('RGB', 'RGBA') else image.convert('RGBA')
+        arr = np.asarray(source)
+        rgb = arr[:, :, :3].astype(np.float32)
         
-        # Zastosowanie różnych ulepszeń
+        # Kolejność i wzory jak w ImageEnhance: wynik = bazowy + (obraz - bazowy) * współczynnik;
+        # przycięcie do 0..255 po każdym kroku, tak jak robi to każdy enhancer w PIL
         if 'brightness' in retouch_settings:
-            enhancer = ImageEnhance.Brightness(enhanced)
-            enhanced = enhancer.enhance(retouch_settings['brightness'])
+            rgb *= retouch_settings['brightness']
+            np.clip(rgb, 0, 255, out=rgb)
             
         if 'contrast' in retouch_settings:
-            enhancer = ImageEnhance.Contrast(enhanced)
-            enhanced = enhancer.enhance(retouch_settings['contrast'])
+            # Średnia jak w ImageEnhance.Contrast: z luminancji (tryb L) przyciętego, zaokrąglonego obrazu
+            luma = np.rint(rgb) @ LUMA_WEIGHTS
+            np.rint(luma, out=luma)
+            gray_mean = float(int(luma.mean() + 0.5))
+            rgb -= gray_mean
+            rgb *= retouch_settings['contrast']
+            rgb += gray_mean
+            np.clip(rgb, 0, 255, out=rgb)
             
         if 'sharpness' in retouch_settings:
-            enhancer = ImageEnhance.Sharpness(enhanced)
-            enhanced = enhancer.enhance(retouch_settings['sharpness'])
+            smooth = cv2.filter2D(rgb, -1, SMOOTH_KERNEL, borderType=cv2.BORDER_REPLICATE)
+            rgb -= smooth
+            rgb *= retouch_settings['sharpness']
+            rgb += smooth
+            np.clip(rgb, 0, 255, out=rgb)
             
         if 'color' in retouch_settings:
-            enhancer = ImageEnhance.Color(enhanced)
-            enhanced = enhancer.enhance(retouch_settings['color'])
+            gray = (rgb @ LUMA_WEIGHTS)[:, :, np.newaxis]
+            rgb -= gray
+            rgb *= retouch_settings['color']
+            rgb += gray
+            np.clip(rgb, 0, 255, out=rgb)
             
-        return enhanced
+        rgb += 0.5
+        out = rgb.astype(np.uint8)
+        if arr.shape[2] == 4:
+            out = np.dstack((out, arr[:, :, 3]))
+            return Image.fromarray(out, 'RGBA')
+        return Image.fromarray(out, 'RGB')
         
     def apply_watermark(self, image, watermark_settings):
         """Nakłada znak wodny na obraz."""
@@ -138,10 +224,25 @@ class ImageProcessor(QObject):
             x = (image.width - watermark.width) // 2
             y = (image.height - watermark.height) // 2
             
-        # Nałożenie znaku wodnego z przezroczystością
-        watermark.putalpha(int(255 * opacity))
-        image.paste(watermark, (x, y), watermark)
+        # Nałożenie znaku wodnego z przezroczystością - skalowanie istniejącego kanału alfa
+        # (putalpha nadpisywało go, gubiąc przezroczyste krawędzie PNG)
+        arr = np.array(watermark.convert('RGBA'))
+        arr[..., 3] = (arr[..., 3].astype(np.uint16) * int(255 * opacity) // 255).astype(np.uint8)
+        watermark = Image.fromarray(arr, 'RGBA')
+        
+        # Ujemne przesunięcie przycina znak wodny na krawędzi (jak paste), zamiast go przesuwać
+        source = (max(0, -x), max(0, -y))
+        if source[0] >= watermark.width or source[1] >= watermark.height:
+            return image
+        
+        original_mode = image.mode
+        if original_mode != 'RGBA':
+            image = image.convert('RGBA')
+        image.alpha_composite(watermark, (max(0, x), max(0, y)), source)
         
+        # Tryb wyjściowy jak na wejściu (np. RGB dla zapisu JPEG)
+        if original_mode != 'RGBA':
+            image = image.convert(original_mode)
         return image
         
     def prepare_for_marketplace(self, image, marketplace_settings):
@@ -149,8 +250,8 @@ class ImageProcessor(QObject):
         # Pobranie wymaganych wymiarów
         target_size = marketplace_settings.get('size', (1000, 1000))
         
-        # Skalowanie z zachowaniem proporcji
-        image.thumbnail(target_size, Image.Resampling.LANCZOS)
+        # Skalowanie z zachowaniem proporcji (reducing_gap: szybkie wstępne zmniejszenie, potem LANCZOS)
+        image.thumbnail(target_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
         
         # Tworzenie nowego obrazu o dokładnych wymiarach
         new_image = Image.new('RGBA', target_size, (255, 255, 255, 0))
@@ -162,6 +263,12 @@ class ImageProcessor(QObject):
         
         return new_image
         
+    def load_for_marketplace(self, image_path, marketplace_settings):
+        """Wczytuje plik od razu pomniejszony do rozmiaru marketplace (shrink-on-load) i przygotowuje go."""
+        target_size = marketplace_settings.get('size', (1000, 1000))
+        image = load_image_downscaled(image_path, target_size)
+        return self.prepare_for_marketplace(image, marketplace_settings)
+        
     def save_image(self, image, output_path, format_settings):
         """Zapisuje obraz w określonym formacie."""
         # Przygotowanie formatu
@@ -171,20 +278,36 @@ class ImageProcessor(QObject):
         # Optymalizacja
         if format_settings.get('optimize', True):
             if output_format.upper() == 'JPEG':
-                image = image.convert('RGB')
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
                 image.save(output_path, 
                          format=output_format,
                          quality=quality,
                          optimize=True)
             elif output_format.upper() == 'PNG':
+                # Bez optimize=True - w Pillow wymusza ono compress_level=9
                 image.save(output_path,
                          format=output_format,
-                         optimize=True,
-                         compress_level=9)
+                         compress_level=format_settings.get('compress_level', DEFAULT_PNG_COMPRESS_LEVEL))
+                if format_settings.get('oxipng') and HAS_OXIPNG:
+                    oxipng.optimize(output_path)
             elif output_format.upper() == 'WEBP':
+                lossless = format_settings.get('lossless', 'auto')
+                if lossless == 'auto':
+                    lossless = self._is_flat_image(image)
                 image.save(output_path,
                          format=output_format,
                          quality=quality,
-                         method=6)
+                         method=format_settings.get('webp_method', DEFAULT_WEBP_METHOD),
+                         lossless=bool(lossless))
         else:
             image.save(output_path, format=output_format, quality=quality)
+            
+    @staticmethod
+    def _is_flat_image(image):
+        """Sprawdza na małej próbce, czy obraz ma mało kolorów (grafika płaska zamiast zdjęcia)."""
+        sample = image.resize(
+            (min(image.width, FLAT_IMAGE_SAMPLE_SIZE[0]), min(image.height, FLAT_IMAGE_SAMPLE_SIZE[1])),
+            Image.Resampling.NEAREST
+        )
+        return sample.getcolors(maxcolors=FLAT_IMAGE_MAX_COLORS) is not None
@@ -1,6 +1,9 @@
 import os
 import json
 import logging
+import time
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
@@ -9,11 +12,49 @@ from PyQt6.QtCore import QObject, pyqtSignal
 
 from ..models.license import License, LicenseStatus, LicenseType
 from ..models.subscription import Subscription, SubscriptionPlan, SubscriptionStatus
-from ..services.encryption_service import get_encryption_service
-from ..services.lemonsqueezy_api import LemonSqueezyAPI
 
 logger = logging.getLogger(__name__)
 
+# Maksymalny wiek zapamiętanych uprawnień - licencja może wygasnąć bez żadnego zdarzenia
+PERMISSION_CACHE_TTL = 60.0
+
+# Plany PRO (jeden zbiór zamiast literału przy każdym sprawdzeniu)
+_PRO_PLANS = frozenset((SubscriptionPlan.PRO_MONTHLY, SubscriptionPlan.PRO_YEARLY))
+
+@dataclass(frozen=True, slots=True)
+class SubscriptionInfo:
+    """Niezmienny widok informacji o subskrypcji dla UI - współdzielony bez kopiowania.
+    
+    Obsługuje odczyt jak słownik (info['plan'], info.get(...)), więc dotychczasowy kod UI działa bez zmian.
+    """
+    plan: str
+    status: str
+    expires_at: Optional[str]
+    days_until_expiry: Optional[int]
+    in_grace_period: bool
+    grace_days_left: int
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+FREE_SUBSCRIPTION_INFO = SubscriptionInfo(
+    plan='FREE',
+    status='ACTIVE',
+    expires_at=None,
+    days_until_expiry=None,
+    in_grace_period=False,
+    grace_days_left=0
+)
+
 class LicenseController(QObject):
     """Główny kontroler zarządzania licencją aplikacji."""
     
@@ -23,6 +64,10 @@ class LicenseController(QObject):
     verification_required = pyqtSignal()
     grace_period_warning = pyqtSignal(int)  # dni pozostałe
     
+    # Konfiguracja (stałe klasy - wspólne dla instancji, nie w __dict__ każdej z nich)
+    VERIFICATION_INTERVAL = timedelta(hours=24)
+    GRACE_PERIOD_DAYS = 7
+    
     def __init__(self, app_data_dir: str = None):
         super().__init__()
         
@@ -34,13 +79,17 @@ class LicenseController(QObject):
             print("🔧 DEV MODE: All licensing restrictions bypassed")
         
         # Ścieżki
+        # Katalog tworzony dopiero przy pierwszym zapisie licencji (w dev mode nigdy)
         self.app_data_dir = Path(app_data_dir) if app_data_dir else Path.cwd() / "data"
-        self.app_data_dir.mkdir(exist_ok=True)
         self.license_file = self.app_data_dir / "license.enc"
+        # Obecność pliku licencji sprawdzana raz (stat) i aktualizowana przy zapisie; w dev mode bez pliku
+        self._license_file_present = False if self.dev_mode else self.license_file.exists()
         
-        # Serwisy - tylko jeśli nie dev mode
+        # Serwisy - tylko jeśli nie dev mode (import tutaj: w dev mode bez kosztu cryptography/requests)
         if not self.dev_mode:
             try:
+                from ..services.encryption_service import get_encryption_service
+                from ..services.lemonsqueezy_api import LemonSqueezyAPI
                 self.encryption_service = get_encryption_service()
                 self.api = LemonSqueezyAPI()
             except Exception as e:
@@ -55,9 +104,27 @@ class LicenseController(QObject):
         self._current_license: Optional[License] = None
         self._last_verification = None
         
-        # Konfiguracja
-        self.VERIFICATION_INTERVAL = timedelta(hours=24)
-        self.GRACE_PERIOD_DAYS = 7
+        # Zapamiętane uprawnienia - przeliczane przy zmianie licencji (i najpóźniej po PERMISSION_CACHE_TTL)
+        if self.dev_mode:
+            self._perm_cache = {'pro': True, 'batch': True, 'csv': True, 'is_pro': True, 'is_free': False}
+            self._perm_cache_until = float('inf')
+        else:
+            self._perm_cache = {'pro': False, 'batch': False, 'csv': False, 'is_pro': False, 'is_free': True}
+            self._perm_cache_until = 0.0
+            
+        # Informacje o subskrypcji dla UI - budowane raz i unieważniane razem z uprawnieniami
+        self._dev_subscription_info: Optional[SubscriptionInfo] = None
+        self._subscription_info_cache: Optional[SubscriptionInfo] = None
+        
+        # 🔧 DEV MODE: tryb ustalony przy starcie - metody uprawnień zastąpione stałymi
+        if self.dev_mode:
+            self._dev_subscription_info = self._build_dev_subscription_info(
+                datetime.now() + timedelta(days=365)
+            )
+            self.can_access_pro_features = lambda: True
+            self.can_access_batch_processing = lambda: True
+            self.can_access_csv_xml_import = lambda: True
+            self.get_subscription_info = lambda: self._dev_subscription_info
         
     def initialize(self) -> bool:
         """Inicjalizuje kontroler licencji przy starcie aplikacji."""
@@ -94,7 +161,7 @@ class LicenseController(QObject):
         if self.dev_mode:
             return True  # Skip w dev mode
         try:
-            if not self.license_file.exists():
+            if not self._license_file_present:
                 logger.info("Plik licencji nie istnieje")
                 return False
 
@@ -108,8 +175,9 @@ class LicenseController(QObject):
                 # Jeśli jest string, sparsuj JSON
                 license_data = json.loads(decrypted_data)
 
-            # Recreate license object
-            self._current_license = License.from_dict(license_data)
+            # Recreate license object (pola parsowane leniwie, przy pierwszym odczycie)
+            self._current_license = License.from_dict_lazy(license_data)
+            self._recompute_permissions()
 
             logger.info("Licencja załadowana z pliku")
             return True
@@ -130,7 +198,9 @@ class LicenseController(QObject):
             license_data = self._current_license.to_dict()
 
             # Zaszyfruj i zapisz (encryption_service sam serializuje do JSON)
+            self.app_data_dir.mkdir(parents=True, exist_ok=True)
             self.encryption_service.encrypt_file(str(self.license_file), license_data)
+            self._license_file_present = True
 
             logger.info("Licencja zapisana do pliku")
             return True
@@ -143,6 +213,7 @@ class LicenseController(QObject):
         """Tworzy darmową licencję."""
         try:
             self._current_license = License.create_free_license()
+            self._recompute_permissions()
             
             # Zapisz do pliku
             self.save_license_to_file()
@@ -159,13 +230,14 @@ class LicenseController(QObject):
         """Tworzy fałszywą licencję Pro dla trybu deweloperskiego."""
         try:
             # Utwórz fałszywą subskrypcję Pro
+            expires_at = datetime.now() + timedelta(days=365)  # Rok ważności
             fake_subscription = Subscription(
                 subscription_id="dev_fake_subscription",
                 plan=SubscriptionPlan.PRO_YEARLY,
                 status=SubscriptionStatus.ACTIVE,
                 customer_email="dev@example.com",
                 created_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(days=365),  # Rok ważności
+                expires_at=expires_at,
                 price=99.99,
                 currency="USD"
             )
@@ -177,9 +249,10 @@ class LicenseController(QObject):
                 status=LicenseStatus.VALID,
                 subscription=fake_subscription,
                 created_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(days=365),
+                expires_at=expires_at,
                 last_verified_at=datetime.now()
             )
+            self._dev_subscription_info = self._build_dev_subscription_info(expires_at)
 
             # Emit signal
             self.license_status_changed.emit(self._current_license.status)
@@ -254,6 +327,7 @@ class LicenseController(QObject):
                 logger.warning("Licencja wygasła - potwierdzono online")
             
             # Zapisz zmiany
+            self._recompute_permissions()
             self.save_license_to_file()
             self.license_status_changed.emit(self._current_license.status)
             self.subscription_updated.emit(self._current_license.subscription)
@@ -274,6 +348,7 @@ class LicenseController(QObject):
             if not self._current_license.grace_period_start:
                 self._current_license.grace_period_start = datetime.now()
             
+            self._recompute_permissions()
             self.save_license_to_file()
             self.license_status_changed.emit(LicenseStatus.GRACE_PERIOD)
             
@@ -307,6 +382,7 @@ class LicenseController(QObject):
                 self._current_license.status = LicenseStatus.ACTIVE
             else:
                 self._current_license.status = LicenseStatus.EXPIRED
+            self._recompute_permissions()
             
             # Zapisz
             self.save_license_to_file()
@@ -338,6 +414,7 @@ class LicenseController(QObject):
             
             # Utwórz nową licencję
             self._current_license = License.create_pro(new_subscription)
+            self._recompute_permissions()
             
             # Zapisz
             self.save_license_to_file()
@@ -355,29 +432,40 @@ class LicenseController(QObject):
     
     # Publiczne metody do sprawdzania uprawnień
     
+    def _recompute_permissions(self) -> None:
+        """Przelicza zapamiętane uprawnienia z aktualnej licencji (wołane przy każdej jej zmianie)."""
+        if self.dev_mode:
+            return  # 🔧 DEV MODE: uprawnienia ustawione raz w __init__
+        license_ = self._current_license
+        if not license_:
+            pro = is_pro = False
+            is_free = True
+        else:
+            pro = license_.can_access_pro_features()
+            plan = license_.subscription.plan
+            is_pro = plan in _PRO_PLANS
+            is_free = plan == SubscriptionPlan.FREE
+        self._perm_cache = {'pro': pro, 'batch': pro, 'csv': pro, 'is_pro': is_pro, 'is_free': is_free}
+        self._perm_cache_until = time.monotonic() + PERMISSION_CACHE_TTL
+        self._subscription_info_cache = None
+        
+    def _permissions(self) -> dict:
+        """Zwraca zapamiętane uprawnienia, odświeżając je po upływie PERMISSION_CACHE_TTL."""
+        if time.monotonic() >= self._perm_cache_until:
+            self._recompute_permissions()
+        return self._perm_cache
+    
     def can_access_batch_processing(self) -> bool:
         """Sprawdza czy użytkownik może korzystać z batch processing."""
-        if self.dev_mode:
-            return True  # 🔧 DEV MODE: zawsze TRUE
-        if not self._current_license:
-            return False
-        return self._current_license.can_access_pro_features()
+        return self._permissions()['batch']
     
     def can_access_csv_xml_import(self) -> bool:
         """Sprawdza czy użytkownik może korzystać z CSV/XML import."""
-        if self.dev_mode:
-            return True  # 🔧 DEV MODE: zawsze TRUE
-        if not self._current_license:
-            return False
-        return self._current_license.can_access_pro_features()
+        return self._permissions()['csv']
     
     def can_access_pro_features(self) -> bool:
         """Sprawdza czy użytkownik może korzystać z funkcji PRO."""
-        if self.dev_mode:
-            return True  # 🔧 DEV MODE: zawsze TRUE
-        if not self._current_license:
-            return False
-        return self._current_license.can_access_pro_features()
+        return self._permissions()['pro']
     
     # Gettery
     
@@ -396,52 +484,46 @@ class LicenseController(QObject):
     @property
     def is_pro_user(self) -> bool:
         """Sprawdza czy użytkownik ma plan PRO."""
-        if self.dev_mode:
-            return True  # 🔧 DEV MODE: zawsze TRUE
-        if not self._current_license:
-            return False
-        plan = self._current_license.subscription.plan
-        return plan in [SubscriptionPlan.PRO_MONTHLY, SubscriptionPlan.PRO_YEARLY]
+        return self._permissions()['is_pro']
     
     @property
     def is_free_user(self) -> bool:
         """Sprawdza czy użytkownik ma plan FREE."""
-        if self.dev_mode:
-            return False  # 🔧 DEV MODE: zawsze FALSE (bo jesteś Pro)
-        if not self._current_license:
-            return True
-        return self._current_license.subscription.plan == SubscriptionPlan.FREE
+        return self._permissions()['is_free']
     
-    def get_subscription_info(self) -> dict:
-        """Zwraca informacje o subskrypcji dla UI."""
+    @staticmethod
+    def _build_dev_subscription_info(expires_at: datetime) -> SubscriptionInfo:
+        """Stałe informacje o fałszywej subskrypcji Pro (tryb deweloperski)."""
+        return SubscriptionInfo(
+            plan='PRO_YEARLY',
+            status='ACTIVE',
+            expires_at=expires_at.isoformat(),
+            days_until_expiry=365,
+            in_grace_period=False,
+            grace_days_left=0
+        )
+    
+    def get_subscription_info(self) -> SubscriptionInfo:
+        """Zwraca informacje o subskrypcji dla UI (niezmienny widok, odczyt jak ze słownika)."""
         if self.dev_mode:
-            return {
-                'plan': 'PRO_YEARLY',
-                'status': 'ACTIVE',
-                'expires_at': (datetime.now() + timedelta(days=365)).isoformat(),
-                'days_until_expiry': 365,
-                'in_grace_period': False,
-                'grace_days_left': 0
-            }
+            return self._dev_subscription_info
         if not self._current_license:
-            return {
-                'plan': 'FREE',
-                'status': 'ACTIVE',
-                'expires_at': None,
-                'days_until_expiry': None,
-                'in_grace_period': False,
-                'grace_days_left': 0
-            }
+            return FREE_SUBSCRIPTION_INFO
         
-        subscription = self._current_license.subscription
-        return {
-            'plan': subscription.plan.value,
-            'status': subscription.status.value,
-            'expires_at': subscription.expires_at.isoformat() if subscription.expires_at else None,
-            'days_until_expiry': subscription.days_until_expiry(),
-            'in_grace_period': self._current_license.status == LicenseStatus.GRACE_PERIOD,
-            'grace_days_left': self._current_license.get_grace_period_days_left() if self._current_license.status == LicenseStatus.GRACE_PERIOD else 0
-        }
+        # Ten sam termin ważności co uprawnienia - dni do wygaśnięcia liczone najwyżej co PERMISSION_CACHE_TTL
+        self._permissions()
+        if self._subscription_info_cache is None:
+            subscription = self._current_license.subscription
+            in_grace_period = self._current_license.status == LicenseStatus.GRACE_PERIOD
+            self._subscription_info_cache = SubscriptionInfo(
+                plan=subscription.plan.value,
+                status=subscription.status.value,
+                expires_at=subscription.expires_at.isoformat() if subscription.expires_at else None,
+                days_until_expiry=subscription.days_until_expiry(),
+                in_grace_period=in_grace_period,
+                grace_days_left=self._current_license.get_grace_period_days_left() if in_grace_period else 0
+            )
+        return self._subscription_info_cache
     
     def force_online_verification(self) -> bool:
         """Wymusza weryfikację online (dla przycisków refresh)."""
@@ -463,10 +545,16 @@ class LicenseController(QObject):
 
 # Singleton instance
 _license_controller_instance = None
+_license_controller_lock = threading.Lock()
 
 def get_license_controller(app_data_dir: str = None) -> LicenseController:
-    """Zwraca singleton instancję LicenseController."""
+    """Zwraca singleton instancję LicenseController (app_data_dir liczy się tylko przy pierwszym wywołaniu)."""
     global _license_controller_instance
-    if _license_controller_instance is None:
-        _license_controller_instance = LicenseController(app_data_dir)
-    return _license_controller_instance
\ No newline at end of file
+    instance = _license_controller_instance
+    if instance is not None:
+        return instance
+    # Tworzenie pod blokadą - dwa wątki nie utworzą dwóch kontrolerów
+    with _license_controller_lock:
+        if _license_controller_instance is None:
+            _license_controller_instance = LicenseController(app_data_dir)
+        return _license_controller_instance
\ No newline at end of file
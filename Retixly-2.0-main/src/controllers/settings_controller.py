@@ -1,133 +1,241 @@
 from PyQt6.QtCore import QSettings, QObject, pyqtSignal
 import json
 import os
+from types import MappingProxyType
+
+# orjson jest opcjonalny - szybsza serializacja sekcji zapisanych jako JSON
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _json_dumps(value):
+    """Serializuje wartość do tekstu JSON (orjson, jeśli jest dostępny)."""
+    if HAS_ORJSON:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
+def _json_loads(value):
+    """Parsuje tekst lub bajty JSON (orjson, jeśli jest dostępny)."""
+    if HAS_ORJSON:
+        return orjson.loads(value)
+    return json.loads(value)
+
+# Znacznik wartości zapisanych jako JSON - parsowane są tylko one, bez prób na zwykłych tekstach
+JSON_PREFIX = '__json__:'
+
+def _encode_value(value):
+    """Zamienia słownik na oznaczony tekst JSON; pozostałe wartości bez zmian."""
+    if isinstance(value, dict):
+        return JSON_PREFIX + _json_dumps(value)
+    return value
+
+def _to_bool(value, default):
+    return str(value).lower() == 'true'
+
+def _to_number(value, default):
+    try:
+        return type(default)(value)
+    except (ValueError, TypeError):
+        return default
+
+def _to_dict(value, default):
+    if isinstance(value, dict):
+        return value
+    # Wartości zapisane przed wprowadzeniem JSON_PREFIX
+    try:
+        return _json_loads(value)
+    except (ValueError, TypeError):
+        return default
+
+# Konwersja odczytanej wartości według typu wartości domyślnej (jedno wyszukanie zamiast isinstance)
+_COERCERS = {
+    bool: _to_bool,
+    int: _to_number,
+    float: _to_number,
+    dict: _to_dict,
+}
+
+# Nazwa pliku INI kontrolera (%APPDATA%/RetixlySoft/<nazwa>.ini)
+SETTINGS_FILE_NAME = 'RetixlySettings'
+
+# Domyślne ustawienia - budowane raz przy imporcie (load_defaults/reset_section tylko je czytają)
+_DEFAULTS = MappingProxyType({
+    'general': {
+        'language': 'en',
+        'theme': 'light',
+        'auto_save': True,
+        'check_updates': True
+    },
+    'processing': {
+        'default_background': '#FFFFFF',
+        'jpeg_quality': 85,
+        'optimize_output': True,
+        'preserve_metadata': False
+    },
+    'watermark': {
+        'enabled': False,
+        'path': '',
+        'position': 'bottom-right',
+        'opacity': 0.5,
+        'scale': 0.2
+    },
+    'retouch': {
+        'brightness': 1.0,
+        'contrast': 1.0,
+        'saturation': 1.0,
+        'sharpness': 1.0
+    },
+    'export': {
+        'default_format': 'PNG',
+        'filename_pattern': '{original_name}_{size}',
+        'default_path': os.path.expanduser('~/Pictures/Retixly')
+    },
+    'marketplace': {
+        'default': 'Amazon',
+        'auto_resize': True,
+        'naming_convention': True
+    },
+    'cloud': {
+        'gdrive_credentials': '',
+        's3_credentials': '',
+        'ftp_settings': '',
+        'imgbb_key': ''
+    }
+})
 
 class SettingsController(QObject):
     settings_changed = pyqtSignal(str, object)  # sekcja, nowa_wartość
+    settings_bulk_changed = pyqtSignal(dict)  # {sekcja: {klucz: wartość}} po bulk_set
     
     def __init__(self):
         super().__init__()
-        self.settings = QSettings('RetixlySoft', 'Retixly')
+        # Plik INI zamiast rejestru Windows - jeden zapis pliku przy sync() zamiast transakcji na klucz.
+        # Osobny plik kontrolera: Retixly.ini (domyślny QSettings()) należy do widoków (geometria okna itp.)
+        self.settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope,
+                                  'RetixlySoft', SETTINGS_FILE_NAME)
+        if not self.settings.contains('general/initialized'):
+            self._migrate_native_settings()
+        # Surowe wartości odczytane z QSettings ('sekcja/klucz' -> wartość) - rejestr/plik ini czytany raz
+        self._cache = {}
         self.load_defaults()
         
-    def load_defaults(self):
-        """Ładuje domyślne ustawienia, jeśli nie istnieją."""
-        defaults = {
-            'general': {
-                'language': 'en',
-                'theme': 'light',
-                'auto_save': True,
-                'check_updates': True
-            },
-            'processing': {
-                'default_background': '#FFFFFF',
-                'jpeg_quality': 85,
-                'optimize_output': True,
-                'preserve_metadata': False
-            },
-            'watermark': {
-                'enabled': False,
-                'path': '',
-                'position': 'bottom-right',
-                'opacity': 0.5,
-                'scale': 0.2
-            },
-            'retouch': {
-                'brightness': 1.0,
-                'contrast': 1.0,
-                'saturation': 1.0,
-                'sharpness': 1.0
-            },
-            'export': {
-                'default_format': 'PNG',
-                'filename_pattern': '{original_name}_{size}',
-                'default_path': os.path.expanduser('~/Pictures/Retixly')
-            },
-            'marketplace': {
-                'default': 'Amazon',
-                'auto_resize': True,
-                'naming_convention': True
-            },
-            'cloud': {
-                'gdrive_credentials': '',
-                's3_credentials': '',
-                'ftp_settings': '',
-                'imgbb_key': ''
-            }
-        }
+    def _migrate_native_settings(self):
+        """Przenosi sekcje kontrolera zapisane wcześniej w rejestrze (lub we wspólnym Retixly.ini) do własnego pliku INI."""
+        sources = (
+            QSettings('RetixlySoft', 'Retixly'),  # format natywny (rejestr)
+            QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope, 'RetixlySoft', 'Retixly'),
+        )
+        for source in sources:
+            # Tylko klucze sekcji tego kontrolera - bez MainWindow/*, batch_processing/* itd.
+            keys = [key for key in source.allKeys() if key.split('/', 1)[0] in _DEFAULTS]
+            if not keys:
+                continue
+            for key in keys:
+                self.settings.setValue(key, source.value(key))
+            self.settings.sync()
+            return
         
-        # Sprawdzenie i ustawienie domyślnych wartości
-        for section, values in defaults.items():
-            if not self.settings.contains(f'{section}/initialized'):
-                for key, value in values.items():
-                    self.set_value(section, key, value)
-                self.settings.setValue(f'{section}/initialized', True)
+    def load_defaults(self):
+        """Ładuje domyślne ustawienia, jeśli nie istnieją. Zwraca zainicjalizowane sekcje."""
+        # Sprawdzenie i ustawienie domyślnych wartości - zapis bezpośrednio do QSettings
+        # (bez sygnału settings_changed na każdy klucz) i jeden sync() na końcu
+        initialized = {}
+        for section, values in _DEFAULTS.items():
+            if self.settings.contains(f'{section}/initialized'):
+                continue
+            self.settings.beginGroup(section)
+            for key, value in values.items():
+                self.settings.setValue(key, _encode_value(value))
+            self.settings.setValue('initialized', True)
+            self.settings.endGroup()
+            initialized[section] = values
+            
+        if initialized:
+            self.settings.sync()
+        return initialized
                 
     def get_value(self, section, key, default=None):
         """Pobiera wartość ustawienia."""
-        value = self.settings.value(f'{section}/{key}', default)
-        
-        # Konwersja typu dla wartości boolean i numerycznych
-        if isinstance(default, bool):
-            return str(value).lower() == 'true'
-        elif isinstance(default, (int, float)):
-            try:
-                return type(default)(value)
-            except (ValueError, TypeError):
-                return default
-        elif isinstance(default, dict):
+        full_key = f'{section}/{key}'
+        try:
+            value = self._cache[full_key]
+        except KeyError:
+            value = self._cache[full_key] = self.settings.value(full_key)
+        if value is None:
+            value = default
+        elif isinstance(value, str) and value.startswith(JSON_PREFIX):
             try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
+                return _json_loads(value[len(JSON_PREFIX):])
+            except ValueError:
                 return default
-                
-        return value
+        if default is None:
+            return value
         
-    def set_value(self, section, key, value):
-        """Ustawia wartość ustawienia."""
-        # Konwersja słowników do JSON
-        if isinstance(value, dict):
-            value = json.dumps(value)
+        # Konwersja typu dla wartości boolean, numerycznych i słowników (JSON)
+        coercer = _COERCERS.get(type(default))
+        return coercer(value, default) if coercer else value
+        
+    def set_value(self, section, key, value, quiet=False):
+        """Ustawia wartość ustawienia (quiet=True - bez sygnału settings_changed)."""
+        # Konwersja słowników do oznaczonego JSON
+        value = _encode_value(value)
             
+        self._cache[f'{section}/{key}'] = value
         self.settings.setValue(f'{section}/{key}', value)
-        self.settings_changed.emit(f'{section}/{key}', value)
+        if not quiet:
+            self.settings_changed.emit(f'{section}/{key}', value)
+            
+    def bulk_set(self, updates):
+        """Zapisuje wiele ustawień ({sekcja: {klucz: wartość}}) i emituje jeden zbiorczy sygnał."""
+        for section, values in updates.items():
+            for key, value in values.items():
+                self.set_value(section, key, value, quiet=True)
+        self.settings.sync()
+        self.settings_bulk_changed.emit(updates)
         
     def get_section(self, section):
         """Pobiera wszystkie ustawienia z danej sekcji."""
         self.settings.beginGroup(section)
-        values = {}
-        for key in self.settings.childKeys():
-            if key != 'initialized':
-                values[key] = self.get_value(section, key)
+        keys = self.settings.childKeys()
         self.settings.endGroup()
-        return values
+        # Odczyt po endGroup() - get_value używa pełnych kluczy 'sekcja/klucz'
+        return {key: self.get_value(section, key) for key in keys if key != 'initialized'}
         
     def reset_section(self, section):
         """Resetuje sekcję do wartości domyślnych."""
         self.settings.beginGroup(section)
         self.settings.remove('')
         self.settings.endGroup()
-        self.load_defaults()
+        prefix = f'{section}/'
+        for cached_key in [k for k in self._cache if k.startswith(prefix)]:
+            del self._cache[cached_key]
+        # Powiadomienie o przywróconych wartościach (load_defaults zapisuje bez sygnałów)
+        for key, value in self.load_defaults().get(section, {}).items():
+            self.settings_changed.emit(f'{section}/{key}', _encode_value(value))
         
     def export_settings(self, file_path):
         """Eksportuje wszystkie ustawienia do pliku."""
         settings_dict = {}
-        for section in self.settings.childGroups():
+        # Tylko sekcje kontrolera (wartości serializowalne do JSON)
+        for section in _DEFAULTS:
             settings_dict[section] = self.get_section(section)
             
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(settings_dict, f, indent=4)
+        if HAS_ORJSON:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(settings_dict, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(settings_dict, f, indent=4)
             
     def import_settings(self, file_path):
         """Importuje ustawienia z pliku."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                settings_dict = json.load(f)
+            with open(file_path, 'rb') as f:
+                settings_dict = _json_loads(f.read())
                 
-            for section, values in settings_dict.items():
-                for key, value in values.items():
-                    self.set_value(section, key, value)
-                    
+            self.bulk_set(settings_dict)
             return True
         except Exception as e:
             print(f"Error importing settings: {e}")
@@ -1,15 +1,82 @@
 import os
+import time
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
 
-from PyQt6.QtCore import QObject, pyqtSignal
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt6.QtCore import QObject, QCoreApplication, pyqtSignal
 
 from ..models.subscription import Subscription, SubscriptionPlan
 from ..services.lemonsqueezy_api import LemonSqueezyAPI
 
 logger = logging.getLogger(__name__)
 
+# Opcje upgrade zależą wyłącznie od aktualnego planu - budowane raz przy imporcie
+_UPGRADE_OPTIONS_BY_PLAN = {
+    # Jeśli FREE, pokaż wszystkie opcje PRO
+    SubscriptionPlan.FREE: {
+        'current_plan': SubscriptionPlan.FREE.value,
+        'options': [
+            {
+                'plan': SubscriptionPlan.PRO_MONTHLY,
+                'name': 'Retixly Pro Monthly',
+                'price': '$9.99/month',
+                'features': [
+                    'Batch Processing (unlimited)',
+                    'CSV/XML Import',
+                    'Advanced Export Options',
+                    'Priority Support'
+                ]
+            },
+            {
+                'plan': SubscriptionPlan.PRO_YEARLY,
+                'name': 'Retixly Pro Yearly',
+                'price': '$99.99/year',
+                'features': [
+                    'Batch Processing (unlimited)',
+                    'CSV/XML Import',
+                    'Advanced Export Options',
+                    'Priority Support',
+                    '2 months FREE!'
+                ],
+                'recommended': True
+            }
+        ],
+        'can_upgrade': True
+    },
+    # Jeśli PRO Monthly, pokaż opcję zmiany na Yearly
+    SubscriptionPlan.PRO_MONTHLY: {
+        'current_plan': SubscriptionPlan.PRO_MONTHLY.value,
+        'options': [
+            {
+                'plan': SubscriptionPlan.PRO_YEARLY,
+                'name': 'Switch to Yearly',
+                'price': '$99.99/year',
+                'features': [
+                    'Same features as Monthly',
+                    'Save $20 per year!'
+                ],
+                'action': 'switch'
+            }
+        ],
+        'can_upgrade': True
+    },
+    SubscriptionPlan.PRO_YEARLY: {
+        'current_plan': SubscriptionPlan.PRO_YEARLY.value,
+        'options': [],
+        'can_upgrade': False
+    }
+}
+
+_UPGRADE_OPTIONS_FALLBACK = {
+    'current_plan': 'FREE',
+    'options': [],
+    'can_upgrade': False
+}
+
 class SubscriptionController(QObject):
     """Kontroler zarządzania subskrypcjami - wrapper dla LemonSqueezy API."""
     
@@ -19,9 +86,31 @@ class SubscriptionController(QObject):
     subscription_resumed = pyqtSignal()
     error_occurred = pyqtSignal(str)
     
+    # Jak długo (s) trzymać szczegóły subskrypcji z API - zmieniają się głównie przez webhooki
+    SUBSCRIPTION_DETAILS_TTL = 60
+    
     def __init__(self):
         super().__init__()
-        self.api = LemonSqueezyAPI()
+        # Jedna sesja HTTP (keep-alive) dla wszystkich wywołań API - bez nowego TCP+TLS na każde żądanie
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # Tylko odczyty - DELETE (anulowanie) po 5xx mógł już się udać
+                allowed_methods=["HEAD", "GET", "OPTIONS"]
+            )
+        ))
+        self._session.headers.update({'Accept': 'application/vnd.api+json'})
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+        self.api = LemonSqueezyAPI(session=self._session)
+        # Cache szczegółów subskrypcji: subscription_id -> (czas pobrania, dane)
+        self._sub_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self._license_controller = None  # Lazy initialization
         
         # Product IDs - te wartości powinny pochodzić z konfiguracji
@@ -35,6 +124,14 @@ class SubscriptionController(QObject):
                 'variant_id': os.getenv('LEMONSQUEEZY_PRO_YEARLY_VARIANT_ID')
             }
         }
+        
+        # Gotowe URL-e checkout per plan - środowisko czytane raz, nie przy każdym kliknięciu
+        self._store_name = os.getenv('LEMONSQUEEZY_STORE_NAME', 'Retixly')
+        self._checkout_urls = {
+            plan: f"https://{self._store_name}.lemonsqueezy.com/checkout/buy/{ids['variant_id']}"
+            for plan, ids in self.PRODUCT_IDS.items()
+            if ids['variant_id']
+        }
     
     @property
     def license_controller(self):
@@ -44,44 +141,51 @@ class SubscriptionController(QObject):
             self._license_controller = get_license_controller()
         return self._license_controller
     
+    def _cache_get(self, subscription_id: str) -> Optional[Dict[str, Any]]:
+        """Zwraca szczegóły subskrypcji z cache, jeśli nie są starsze niż TTL."""
+        entry = self._sub_cache.get(subscription_id)
+        if entry is None:
+            return None
+        fetched_at, data = entry
+        if time.monotonic() - fetched_at >= self.SUBSCRIPTION_DETAILS_TTL:
+            del self._sub_cache[subscription_id]
+            return None
+        return data
+    
+    def _cache_put(self, subscription_id: str, data: Dict[str, Any]) -> None:
+        """Zapisuje szczegóły subskrypcji w cache."""
+        self._sub_cache[subscription_id] = (time.monotonic(), data)
+    
+    def close(self) -> None:
+        """Zamyka współdzieloną sesję HTTP (przy zamykaniu aplikacji)."""
+        self._session.close()
+    
     def create_checkout_url(self, plan: SubscriptionPlan, customer_email: str = None) -> Optional[str]:
         """Tworzy URL do checkout dla wybranego planu."""
         try:
-            print(f"🔍 DEBUG: Tworzenie checkout dla planu: {plan}")
+            logger.debug("Tworzenie checkout dla planu: %s", plan)
             
-            # Pobierz variant_id bezpośrednio z environment
-            if plan == SubscriptionPlan.PRO_MONTHLY:
-                variant_id = os.getenv('LEMONSQUEEZY_PRO_MONTHLY_VARIANT_ID')
-                print(f"🔍 Monthly variant_id: {variant_id}")
-            elif plan == SubscriptionPlan.PRO_YEARLY:
-                variant_id = os.getenv('LEMONSQUEEZY_PRO_YEARLY_VARIANT_ID')
-                print(f"🔍 Yearly variant_id: {variant_id}")
-            else:
-                print(f"❌ Nieobsługiwany plan: {plan}")
+            if plan not in self.PRODUCT_IDS:
+                logger.error("Nieobsługiwany plan: %s", plan)
                 self.error_occurred.emit(f"Nieobsługiwany plan: {plan.value}")
                 return None
             
-            if not variant_id:
-                print(f"❌ Brak variant_id dla planu: {plan}")
+            checkout_url = self._checkout_urls.get(plan)
+            if not checkout_url:
+                logger.error("Brak variant_id dla planu: %s", plan)
                 self.error_occurred.emit("Błąd konfiguracji produktu - brak variant_id")
                 return None
             
-            # Utwórz prosty checkout URL
-            store_name = "Retixly"  # Twoja nazwa sklepu
-            checkout_url = f"https://{store_name}.lemonsqueezy.com/checkout/buy/{variant_id}"
-            
             # Dodaj parametry jeśli potrzebne
             if customer_email:
-                checkout_url += f"?email={customer_email}"
+                checkout_url += '?' + urlencode({'checkout[email]': customer_email})
             
-            print(f"✅ Checkout URL utworzony: {checkout_url}")
+            logger.debug("Checkout URL utworzony: %s", checkout_url)
             self.checkout_url_generated.emit(checkout_url)
             return checkout_url
             
         except Exception as e:
-            print(f"❌ Błąd tworzenia checkout URL: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Błąd tworzenia checkout URL")
             self.error_occurred.emit(f"Błąd tworzenia linku płatności: {str(e)}")
             return None
     
@@ -92,13 +196,17 @@ class SubscriptionController(QObject):
             if not current_subscription or not current_subscription.lemonsqueezy_subscription_id:
                 return None
             
+            subscription_id = current_subscription.lemonsqueezy_subscription_id
+            cached = self._cache_get(subscription_id)
+            if cached is not None:
+                return cached
+            
             # Pobierz dane z API
-            subscription_data = self.api.get_subscription(
-                current_subscription.lemonsqueezy_subscription_id
-            )
+            subscription_data = self.api.get_subscription(subscription_id)
             
             if subscription_data:
                 logger.info("Pobrano szczegóły subskrypcji")
+                self._cache_put(subscription_id, subscription_data)
                 return subscription_data
             else:
                 logger.warning("Nie udało się pobrać szczegółów subskrypcji")
@@ -124,6 +232,7 @@ class SubscriptionController(QObject):
             )
             
             if success:
+                self._sub_cache.pop(current_subscription.lemonsqueezy_subscription_id, None)
                 logger.info("Subskrypcja została anulowana")
                 self.subscription_cancelled.emit()
                 
@@ -155,6 +264,7 @@ class SubscriptionController(QObject):
             )
             
             if success:
+                self._sub_cache.pop(current_subscription.lemonsqueezy_subscription_id, None)
                 logger.info("Subskrypcja została wznowiona")
                 self.subscription_resumed.emit()
                 
@@ -210,6 +320,8 @@ class SubscriptionController(QObject):
             processed = self.api.process_webhook(webhook_data)
             
             if processed:
+                # Dane subskrypcji mogły się zmienić - unieważnij cache
+                self._sub_cache.clear()
                 # Zaktualizuj licencję na podstawie webhook
                 self.license_controller.update_subscription_from_webhook(webhook_data)
                 logger.info("Webhook przetworzony pomyślnie")
@@ -229,6 +341,7 @@ class SubscriptionController(QObject):
             success = self.license_controller.activate_subscription(subscription_id)
             
             if success:
+                self._sub_cache.clear()
                 logger.info(f"Subskrypcja {subscription_id} została aktywowana")
                 return True
             else:
@@ -242,69 +355,17 @@ class SubscriptionController(QObject):
             return False
     
     def get_upgrade_options(self) -> Dict[str, Any]:
-        """Zwraca dostępne opcje upgrade dla UI."""
+        """Zwraca dostępne opcje upgrade dla UI (współdzielony słownik - nie modyfikować)."""
         try:
-            current_plan = (self.license_controller.current_subscription.plan 
-                          if self.license_controller.current_subscription 
-                          else SubscriptionPlan.FREE)
-            
-            options = []
-            
-            # Jeśli FREE, pokaż wszystkie opcje PRO
-            if current_plan == SubscriptionPlan.FREE:
-                options.extend([
-                    {
-                        'plan': SubscriptionPlan.PRO_MONTHLY,
-                        'name': 'Retixly Pro Monthly',
-                        'price': '$9.99/month',
-                        'features': [
-                            'Batch Processing (unlimited)',
-                            'CSV/XML Import',
-                            'Advanced Export Options',
-                            'Priority Support'
-                        ]
-                    },
-                    {
-                        'plan': SubscriptionPlan.PRO_YEARLY,
-                        'name': 'Retixly Pro Yearly',
-                        'price': '$99.99/year',
-                        'features': [
-                            'Batch Processing (unlimited)',
-                            'CSV/XML Import', 
-                            'Advanced Export Options',
-                            'Priority Support',
-                            '2 months FREE!'
-                        ],
-                        'recommended': True
-                    }
-                ])
-            
-            # Jeśli PRO Monthly, pokaż opcję zmiany na Yearly
-            elif current_plan == SubscriptionPlan.PRO_MONTHLY:
-                options.append({
-                    'plan': SubscriptionPlan.PRO_YEARLY,
-                    'name': 'Switch to Yearly',
-                    'price': '$99.99/year',
-                    'features': [
-                        'Same features as Monthly',
-                        'Save $20 per year!'
-                    ],
-                    'action': 'switch'
-                })
-            
-            return {
-                'current_plan': current_plan.value,
-                'options': options,
-                'can_upgrade': len(options) > 0
-            }
+            current_subscription = self.license_controller.current_subscription
+            current_plan = (current_subscription.plan
+                            if current_subscription
+                            else SubscriptionPlan.FREE)
+            return _UPGRADE_OPTIONS_BY_PLAN.get(current_plan, _UPGRADE_OPTIONS_FALLBACK)
             
         except Exception as e:
             logger.error(f"Błąd pobierania opcji upgrade: {e}")
-            return {
-                'current_plan': 'FREE',
-                'options': [],
-                'can_upgrade': False
-            }
+            return _UPGRADE_OPTIONS_FALLBACK
     
     def test_connection(self) -> bool:
         """Testuje połączenie z LemonSqueezy API."""
@@ -324,34 +385,18 @@ class SubscriptionController(QObject):
     def create_checkout_url_simple(self, plan: SubscriptionPlan, customer_email: str = None) -> Optional[str]:
         """Tworzy URL do checkout - wersja uproszczona."""
         try:
-            print(f"🔍 Tworzenie checkout dla: {plan}")
+            logger.debug("Tworzenie checkout dla: %s", plan)
             
-            # Pobierz variant_id
-            if plan == SubscriptionPlan.PRO_MONTHLY:
-                variant_id = os.getenv('LEMONSQUEEZY_PRO_MONTHLY_VARIANT_ID')
-                print(f"🔍 Monthly variant_id: {variant_id}")
-            elif plan == SubscriptionPlan.PRO_YEARLY:
-                variant_id = os.getenv('LEMONSQUEEZY_PRO_YEARLY_VARIANT_ID')
-                print(f"🔍 Yearly variant_id: {variant_id}")
-            else:
-                print(f"❌ Nieobsługiwany plan: {plan}")
+            checkout_url = self._checkout_urls.get(plan)
+            if not checkout_url:
+                logger.error("Brak checkout URL dla planu: %s", plan)
                 return None
             
-            if not variant_id:
-                print(f"❌ Brak variant_id dla planu: {plan}")
-                return None
-            
-            # ZMIEŃ 'your-store' na nazwę swojego sklepu z LemonSqueezy!
-            store_name = "Retixly"  # <-- ZMIEŃ TO!
-            checkout_url = f"https://{store_name}.lemonsqueezy.com/checkout/buy/{variant_id}"
-            
-            print(f"✅ Checkout URL: {checkout_url}")
+            logger.debug("Checkout URL: %s", checkout_url)
             return checkout_url
             
         except Exception as e:
-            print(f"❌ Błąd: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Błąd tworzenia checkout URL")
             return None
 
 # Singleton instance
@@ -6,6 +6,7 @@ This module contains classes for managing local license validation and caching.
 
 from enum import Enum
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import Optional, Dict, Any
 import json
 import hashlib
@@ -31,6 +32,26 @@ class LicenseType(Enum):
     TRIAL = "trial"
 
 
+def _parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO datetime string, returning None for empty or invalid values."""
+    if not dt_str:
+        return None
+    try:
+        return datetime.fromisoformat(dt_str)
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_enum(enum_class, value):
+    """Parse an enum value, returning None for empty or unknown values."""
+    if not value:
+        return None
+    try:
+        return enum_class(value)
+    except ValueError:
+        return None
+
+
 class License:
     """
     Model representing a local license cache.
@@ -393,21 +414,8 @@ class License:
         Returns:
             License: New license instance
         """
-        def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
-            if not dt_str:
-                return None
-            try:
-                return datetime.fromisoformat(dt_str)
-            except (ValueError, TypeError):
-                return None
-        
-        def parse_enum(enum_class, value):
-            if not value:
-                return None
-            try:
-                return enum_class(value)
-            except ValueError:
-                return None
+        parse_datetime = _parse_datetime
+        parse_enum = _parse_enum
         
         # Parse subscription
         subscription = None
@@ -430,6 +438,22 @@ class License:
             max_offline_days=data.get('max_offline_days', 30)
         )
     
+    @classmethod
+    def from_dict_lazy(cls, data: Dict[str, Any]) -> 'LicenseView':
+        """
+        Create a lazily parsed license from dictionary.
+        
+        Fields (enums, datetimes, the nested subscription) are parsed on first
+        access only; assignments work as on a regular License.
+        
+        Args:
+            data: Dictionary containing license data
+            
+        Returns:
+            LicenseView: License backed by the given dictionary
+        """
+        return LicenseView(data)
+    
     @classmethod
     def from_json(cls, json_str: str) -> 'License':
         """
@@ -466,3 +490,67 @@ class License:
         """Detailed string representation of license."""
         return (f"License(id={self.license_id}, type={self.license_type}, "
                 f"status={self.status}, valid={self.is_valid()})")
+
+
+class LicenseView(License):
+    """
+    License backed by its serialized dictionary.
+    
+    Each field is parsed from the dictionary the first time it is read and
+    then cached on the instance, so fields that are never touched (e.g. the
+    nested subscription on a plain status check) are never materialized.
+    Parsing and defaults match License.from_dict.
+    """
+    
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+    
+    @cached_property
+    def license_id(self) -> str:
+        return self._data.get('license_id') or str(uuid.uuid4())
+    
+    @cached_property
+    def license_type(self) -> LicenseType:
+        return _parse_enum(LicenseType, self._data.get('license_type')) or LicenseType.FREE
+    
+    @cached_property
+    def status(self) -> LicenseStatus:
+        return _parse_enum(LicenseStatus, self._data.get('status')) or LicenseStatus.VALID
+    
+    @cached_property
+    def subscription(self) -> Subscription:
+        if self._data.get('subscription'):
+            return Subscription.from_dict(self._data['subscription'])
+        return Subscription.create_free_subscription()
+    
+    @cached_property
+    def created_at(self) -> datetime:
+        return _parse_datetime(self._data.get('created_at')) or datetime.now()
+    
+    @cached_property
+    def updated_at(self) -> datetime:
+        return _parse_datetime(self._data.get('updated_at')) or datetime.now()
+    
+    @cached_property
+    def last_verified_at(self) -> Optional[datetime]:
+        return _parse_datetime(self._data.get('last_verified_at'))
+    
+    @cached_property
+    def expires_at(self) -> Optional[datetime]:
+        return _parse_datetime(self._data.get('expires_at'))
+    
+    @cached_property
+    def hardware_fingerprint(self) -> str:
+        return self._data.get('hardware_fingerprint') or self._generate_hardware_fingerprint()
+    
+    @cached_property
+    def verification_token(self) -> Optional[str]:
+        return self._data.get('verification_token')
+    
+    @cached_property
+    def offline_grace_days(self) -> int:
+        return self._data.get('offline_grace_days', 7)
+    
+    @cached_property
+    def max_offline_days(self) -> int:
+        return self._data.get('max_offline_days', 30)
@@ -29,6 +29,25 @@ class SubscriptionPlan(Enum):
     PRO_YEARLY = "pro_yearly"
 
 
+# Display names, built once instead of on every call
+_PLAN_DISPLAY_NAMES = {
+    SubscriptionPlan.FREE: "Free",
+    SubscriptionPlan.PRO_MONTHLY: "Pro Monthly",
+    SubscriptionPlan.PRO_YEARLY: "Pro Yearly"
+}
+
+_STATUS_DISPLAY_NAMES = {
+    SubscriptionStatus.ACTIVE: "Active",
+    SubscriptionStatus.INACTIVE: "Inactive",
+    SubscriptionStatus.CANCELLED: "Cancelled",
+    SubscriptionStatus.EXPIRED: "Expired",
+    SubscriptionStatus.PAST_DUE: "Past Due",
+    SubscriptionStatus.UNPAID: "Unpaid",
+    SubscriptionStatus.TRIALING: "Trial",
+    SubscriptionStatus.PAUSED: "Paused"
+}
+
+
 class Subscription:
     """
     Model representing a user subscription.
@@ -224,12 +243,7 @@ class Subscription:
         Returns:
             str: Display name for the plan
         """
-        plan_names = {
-            SubscriptionPlan.FREE: "Free",
-            SubscriptionPlan.PRO_MONTHLY: "Pro Monthly",
-            SubscriptionPlan.PRO_YEARLY: "Pro Yearly"
-        }
-        return plan_names.get(self.plan, "Unknown")
+        return _PLAN_DISPLAY_NAMES.get(self.plan, "Unknown")
     
     def get_status_display_name(self) -> str:
         """
@@ -238,17 +252,7 @@ class Subscription:
         Returns:
             str: Display name for the status
         """
-        status_names = {
-            SubscriptionStatus.ACTIVE: "Active",
-            SubscriptionStatus.INACTIVE: "Inactive",
-            SubscriptionStatus.CANCELLED: "Cancelled",
-            SubscriptionStatus.EXPIRED: "Expired",
-            SubscriptionStatus.PAST_DUE: "Past Due",
-            SubscriptionStatus.UNPAID: "Unpaid",
-            SubscriptionStatus.TRIALING: "Trial",
-            SubscriptionStatus.PAUSED: "Paused"
-        }
-        return status_names.get(self.status, "Unknown")
+        return _STATUS_DISPLAY_NAMES.get(self.status, "Unknown")
     
     def to_dict(self) -> Dict[str, Any]:
         """
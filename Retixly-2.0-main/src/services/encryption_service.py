@@ -233,10 +233,29 @@ class EncryptionService:
             logger.error(f"Decryption failed: {e}")
             raise EncryptionError(f"Decryption failed: {e}")
     
+    def encrypt_bytes(self, data: Union[str, dict]) -> bytes:
+        """
+        Encrypt data and return the base64 encoded result as bytes.
+        
+        Args:
+            data: Data to encrypt (string or dictionary)
+            
+        Returns:
+            bytes: ASCII bytes of the base64 encoded encrypted data
+            
+        Raises:
+            EncryptionError: If encryption fails
+        """
+        return self.encrypt(data).encode('ascii')
+    
     def encrypt_file(self, file_path: str, data: Union[str, dict]) -> None:
         """
         Encrypt data and save to file.
         
+        The payload is encrypted fully in memory, written with a single
+        write() to a temporary file and moved into place with os.replace(),
+        so an interrupted save never leaves a truncated file behind.
+        
         Args:
             file_path: Path to save encrypted file
             data: Data to encrypt
@@ -245,16 +264,18 @@ class EncryptionService:
             EncryptionError: If encryption or file operation fails
         """
         try:
-            encrypted_data = self.encrypt(data)
+            payload = self.encrypt_bytes(data)
             
             # Ensure directory exists, but only if directory is not empty
             dir_name = os.path.dirname(file_path)
             if dir_name:
                 os.makedirs(dir_name, exist_ok=True)
             
-            # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(encrypted_data)
+            # Write to a temporary file and replace atomically
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, file_path)
                 
             logger.info(f"Data encrypted and saved to {file_path}")
             
@@ -47,7 +47,8 @@ class LemonSqueezyAPI:
                  store_id: Optional[str] = None,
                  base_url: str = "https://api.lemonsqueezy.com/v1",
                  timeout: int = 30,
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 session: Optional['requests.Session'] = None):
         """
         Initialize LemonSqueezy API client.
         
@@ -57,6 +58,8 @@ class LemonSqueezyAPI:
             base_url: API base URL
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
+            session: Optional shared session (keep-alive pool owned by the caller);
+                when given, its adapters are used as configured and it is not closed here
         """
         if not HAS_REQUESTS:
             raise LemonSqueezyError(
@@ -74,25 +77,27 @@ class LemonSqueezyAPI:
         self.timeout = timeout
         self.max_retries = max_retries
         
-        # Setup session with retry strategy
-        self.session = requests.Session()
+        # Setup session with retry strategy (or reuse the caller's pooled session)
+        self._owns_session = session is None
+        self.session = session if session is not None else requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Accept': 'application/vnd.api+json',
             'Content-Type': 'application/vnd.api+json'
         })
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        if self._owns_session:
+            # Configure retry strategy
+            retry_strategy = Retry(
+                total=max_retries,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["HEAD", "GET", "OPTIONS"]
+            )
+            
+            adapter = HTTPAdapter(max_retries=retry_strategy)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         
         # Product configuration
         self.products = {
@@ -733,7 +738,7 @@ class LemonSqueezyAPI:
     
     def __del__(self):
         """Cleanup when object is destroyed."""
-        if hasattr(self, 'session'):
+        if hasattr(self, 'session') and getattr(self, '_owns_session', True):
             self.session.close()
 
 
@@ -2,53 +2,201 @@ import os
 import sys
 from pathlib import Path
 from PIL import Image, ImageEnhance, ImageFilter
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtCore import Qt
 import cv2
 import numpy as np
 import logging
 import io
+import hashlib
+import threading
+
+# pyvips (libvips) jest opcjonalny - skalowanie przy dekodowaniu bez wczytywania pełnej rozdzielczości
+try:
+    import pyvips
+    HAS_PYVIPS = True
+except (ImportError, OSError):
+    HAS_PYVIPS = False
 
 # Konfiguracja loggera
 logger = logging.getLogger(__name__)
 
-def create_thumbnail(image_path, size=(150, 150)):
-    """Tworzy miniaturę obrazu."""
+# Trwały cache miniatur na dysku (klucz: ścieżka, czas modyfikacji, rozmiar)
+THUMBNAIL_CACHE_DIR = Path.home() / ".cache" / "retixly" / "thumbs"
+THUMBNAIL_CACHE_LIMIT = 200 * 1024 * 1024  # 200 MB
+_PRUNE_EVERY = 100  # co ile zapisów sprawdzać rozmiar cache
+
+_cache_lock = threading.Lock()
+_cache_writes = 0
+
+def _thumbnail_cache_path(image_path, size):
+    """Zwraca ścieżkę pliku cache dla miniatury danego obrazu."""
+    key = f"{os.path.abspath(image_path)}|{os.path.getmtime(image_path)}|{size[0]}x{size[1]}"
+    return THUMBNAIL_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+def _prune_thumbnail_cache():
+    """Usuwa najdawniej używane miniatury, gdy cache przekroczy limit."""
     try:
-        # Sprawdź czy plik istnieje
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Nie znaleziono pliku: {image_path}")
-            
-        # Wczytanie obrazu
-        image = Image.open(image_path)
+        entries = []
+        total = 0
+        with os.scandir(THUMBNAIL_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= THUMBNAIL_CACHE_LIMIT:
+            return
+        entries.sort()
+        for _, file_size, path in entries:
+            os.remove(path)
+            total -= file_size
+            if total <= THUMBNAIL_CACHE_LIMIT:
+                break
+    except OSError as e:
+        logger.warning(f"Błąd czyszczenia cache miniatur: {e}")
+
+def _store_cached_thumbnail(qimage, cache_path):
+    """Zapisuje miniaturę w cache; co _PRUNE_EVERY zapisów przycina cache."""
+    global _cache_writes
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Nie można utworzyć katalogu cache miniatur: {e}")
+        return
+    if not qimage.save(str(cache_path), 'PNG'):
+        logger.warning(f"Nie można zapisać miniatury w cache: {cache_path}")
+        return
+    with _cache_lock:
+        _cache_writes += 1
+        prune = _cache_writes % _PRUNE_EVERY == 0
+    if prune:
+        _prune_thumbnail_cache()
+
+_CV2_THUMBNAIL_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
+# Dekodowanie JPEG od razu w zmniejszonej skali (DCT) - od największego współczynnika
+_CV2_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def _cv2_thumbnail(image_path, size):
+    """Miniatura przez OpenCV; None gdy nie da się zdekodować pliku."""
+    try:
+        # Pillow czyta tylko nagłówek - wymiary potrzebne do wyboru skali dekodowania
+        with Image.open(image_path) as header:
+            width, height = header.size
+        ratio = max(width / size[0], height / size[1])
+        flag = cv2.IMREAD_COLOR
+        for factor, reduced_flag in _CV2_REDUCED_FLAGS:
+            # Zapas 2x, żeby końcowe INTER_AREA miało z czego uśredniać
+            if factor * 2 <= ratio:
+                flag = reduced_flag
+                break
+        
+        # np.fromfile + imdecode zamiast imread - działa też ze ścieżkami spoza ASCII (Windows)
+        img = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), flag)
+        if img is None:
+            return None
+        
+        img_h, img_w = img.shape[:2]
+        scale = min(size[0] / img_w, size[1] / img_h)
+        if scale < 1:
+            img = cv2.resize(img, (max(1, round(img_w * scale)), max(1, round(img_h * scale))),
+                             interpolation=cv2.INTER_AREA)
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        img_h, img_w = img.shape[:2]
+        return QImage(img.data, img_w, img_h, img.strides[0], QImage.Format.Format_RGB888).copy()
+    except Exception as e:
+        logger.debug(f"OpenCV nie wczytał miniatury {image_path}: {e}")
+        return None
+
+def _pil_thumbnail(image_path, size):
+    """Miniatura przez Pillow (wszystkie formaty obsługiwane przez PIL)."""
+    # Wczytanie obrazu - dla JPEG libjpeg skaluje już podczas dekodowania (DCT),
+    # więc pełna rozdzielczość nigdy nie trafia do pamięci
+    with Image.open(image_path) as image:
+        image.draft('RGB', (size[0] * 2, size[1] * 2))
         
         # Konwersja do RGB jeśli potrzeba
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
         # Utworzenie miniatury zachowując proporcje
-        image.thumbnail(size, Image.Resampling.LANCZOS)
+        image.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    
+    # Konwersja do QImage bez pośredniego kodowania PNG
+    return QImage(image.tobytes(), image.width, image.height, image.width * 3,
+                  QImage.Format.Format_RGB888).copy()
+
+def load_image_downscaled(image_path, max_size):
+    """Wczytuje obraz od razu pomniejszony tak, by mieścił się w max_size (bez powiększania).
+    
+    Przy dużych JPEG-ach dekoder skaluje obraz już podczas odczytu (libvips
+    shrink-on-load lub draft() w Pillow), więc pełna rozdzielczość nigdy nie trafia do pamięci.
+    """
+    if HAS_PYVIPS:
+        try:
+            thumb = pyvips.Image.thumbnail(image_path, max_size[0],
+                                           height=max_size[1], size='down')
+            if thumb.interpretation not in ('srgb', 'b-w'):
+                thumb = thumb.colourspace('srgb')
+            if thumb.format != 'uchar':
+                thumb = thumb.cast('uchar')
+            data = np.ndarray(buffer=thumb.write_to_memory(), dtype=np.uint8,
+                              shape=(thumb.height, thumb.width, thumb.bands))
+            return Image.fromarray(data[:, :, 0] if thumb.bands == 1 else data)
+        except Exception as e:
+            logger.warning(f"pyvips nie mógł wczytać {image_path}, używam Pillow: {e}")
+            
+    image = Image.open(image_path)
+    # Dla JPEG dekodowanie w 1/2, 1/4 lub 1/8 rozdzielczości (draft działa tylko przed load())
+    image.draft('RGB', max_size)
+    return image
+
+def create_thumbnail_image(image_path, size=(150, 150)):
+    """Tworzy miniaturę obrazu jako QImage (bezpieczne poza wątkiem GUI)."""
+    try:
+        # Sprawdź czy plik istnieje
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Nie znaleziono pliku: {image_path}")
         
-        # Konwersja do QPixmap
-        img_bytes = io.BytesIO()
-        image.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
+        # Szybka ścieżka - miniatura już jest w cache
+        cache_path = _thumbnail_cache_path(image_path, size)
+        if cache_path.exists():
+            qimage = QImage(str(cache_path))
+            if not qimage.isNull():
+                # Odśwież czas modyfikacji - na nim opiera się kolejność LRU
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return qimage
+            
+        # OpenCV (SIMD) dla JPEG/PNG, Pillow dla pozostałych formatów i gdy OpenCV zawiedzie
+        qimage = None
+        if os.path.splitext(image_path)[1].lower() in _CV2_THUMBNAIL_EXTENSIONS:
+            qimage = _cv2_thumbnail(image_path, size)
+        if qimage is None:
+            qimage = _pil_thumbnail(image_path, size)
         
-        # Wczytaj do QPixmap
-        pixmap = QPixmap()
-        success = pixmap.loadFromData(img_bytes.getvalue())
+        if qimage.isNull():
+            raise Exception("Nie udało się utworzyć QImage")
         
-        if not success:
-            raise Exception("Nie udało się utworzyć QPixmap")
-            
-        return pixmap
+        _store_cached_thumbnail(qimage, cache_path)
+        return qimage
         
     except Exception as e:
         logger.error(f"Błąd tworzenia miniatury dla {image_path}: {str(e)}")
         # Zwróć pustą miniaturę
-        pixmap = QPixmap(size[0], size[1])
-        pixmap.fill(Qt.GlobalColor.lightGray)
-        return pixmap
+        qimage = QImage(size[0], size[1], QImage.Format.Format_RGB888)
+        qimage.fill(Qt.GlobalColor.lightGray)
+        return qimage
+
+def create_thumbnail(image_path, size=(150, 150)):
+    """Tworzy miniaturę obrazu."""
+    return QPixmap.fromImage(create_thumbnail_image(image_path, size))
 
 def resize_image(image, target_size, maintain_aspect=True):
     """Zmienia rozmiar obrazu."""
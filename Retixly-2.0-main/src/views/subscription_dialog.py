@@ -202,7 +202,7 @@ class SubscriptionInfoWidget(QFrame):
                 }
             """)
             
-    def add_pro_info(self, subscription_info: dict):
+    def add_pro_info(self, subscription_info):
         """Dodaje informacje dla użytkowników Pro."""
         # Data wygaśnięcia
         if subscription_info.get('expires_at'):
@@ -1,29 +1,45 @@
 import sys
+import threading
 import importlib
+import importlib.util
 import logging
 
 logger = logging.getLogger(__name__)
 
+REQUIRED = (
+    ('PyQt6', 'PyQt6'),
+    ('Pillow', 'PIL'),
+    ('cryptography', 'cryptography'),
+    ('requests', 'requests'),
+)
+
+OPTIONAL = (
+    ('rembg', 'rembg'),
+    ('numpy', 'numpy'),
+    ('opencv-python', 'cv2'),
+    ('boto3', 'boto3'),
+    ('onnxruntime', 'onnxruntime'),
+)
+
+def _is_available(import_name):
+    """Sprawdza obecność pakietu bez wykonywania jego kodu."""
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
 def check_dependencies_lazy():
     """
     Sprawdza tylko KRYTYCZNE pakiety na starcie.
     Opcjonalne pakiety sprawdzane później.
     """
-    critical_packages = {
-        'PyQt6': 'PyQt6',
-        'Pillow': 'PIL',
-        'cryptography': 'cryptography',
-        'requests': 'requests'
-    }
-    
     missing_critical = []
     
-    for package_name, import_name in critical_packages.items():
-        try:
-            importlib.import_module(import_name)
-            logger.info(f"✅ Critical package {package_name} loaded")
-        except ImportError as e:
-            logger.error(f"❌ Critical package {package_name} missing: {e}")
+    for package_name, import_name in REQUIRED:
+        if _is_available(import_name):
+            logger.info(f"✅ Critical package {package_name} found")
+        else:
+            logger.error(f"❌ Critical package {package_name} missing")
             missing_critical.append(package_name)
     
     return missing_critical
@@ -31,24 +47,16 @@ def check_dependencies_lazy():
 def check_optional_dependencies():
     """
     Sprawdza opcjonalne pakiety - wywoływane dopiero gdy potrzebne.
+    Pakiety są importowane dopiero przy użyciu funkcji, która ich wymaga.
     """
-    optional_packages = {
-        'rembg': 'rembg',
-        'numpy': 'numpy', 
-        'opencv-python': 'cv2',
-        'boto3': 'boto3',
-        'onnxruntime': 'onnxruntime'
-    }
-    
     missing_optional = []
     available_optional = []
     
-    for package_name, import_name in optional_packages.items():
-        try:
-            importlib.import_module(import_name)
+    for package_name, import_name in OPTIONAL:
+        if _is_available(import_name):
             available_optional.append(package_name)
             logger.info(f"✅ Optional package {package_name} available")
-        except ImportError:
+        else:
             missing_optional.append(package_name)
             logger.warning(f"⚠️ Optional package {package_name} missing")
     
@@ -78,13 +86,24 @@ def main():
         
         app = qt['QApplication'](sys.argv)
         
-        setup_environment()
+        # Tworzenie katalogów to czyste I/O - niech nakłada się na start Qt
+        environment_ready = threading.Event()
+        
+        def prepare_environment():
+            try:
+                setup_environment()
+            finally:
+                environment_ready.set()
+        
+        threading.Thread(target=prepare_environment, daemon=True).start()
         
         logger.info(f"🚀 Starting Retixly {APP_VERSION}")
         retixly_app = RetixlyApp()
         
         retixly_app.check_optional_packages_async()
         
+        # Katalogi (temp/, data/) muszą istnieć zanim użytkownik zacznie pracę
+        environment_ready.wait()
         exit_code = retixly_app.run()
         
         cleanup_temp_files()